@@ -5,17 +5,29 @@ import importlib
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
+from .coordinator import TaylorGrillCoordinator
+from .services import async_setup_services
 
 # Add SENSOR and SWITCH to the list of platforms
 PLATFORMS: list[Platform] = [
     Platform.CLIMATE, 
     Platform.SENSOR, 
     Platform.SWITCH, 
-    Platform.BINARY_SENSOR
+    Platform.BINARY_SENSOR,
+    Platform.NUMBER,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Taylor Grill services."""
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Taylor Grill from a config entry."""
     
@@ -23,8 +35,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # This fixes the "Detected blocking call to import_module" error.
     await hass.async_add_executor_job(ensure_platforms_imported)
 
+    # One coordinator per grill behind a shared +/dev2app subscription;
+    # entities register with the coordinator.
+    coordinator = TaylorGrillCoordinator(hass, entry)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
     # Forward the setup to all platforms (Climate, Sensor, Switch)
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        # A failed setup is never unloaded; leave nothing behind
+        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_stop()
+        raise
+
+    # Only start talking to the grill once setup can no longer fail.
+    # Connecting and the first poll run in the background so setup
+    # returns right away.
+    coordinator.async_start()
     entry.async_on_unload(entry.add_update_listener(update_listener))
     return True
 
@@ -35,8 +63,17 @@ def ensure_platforms_imported():
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator: TaylorGrillCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_stop()
+    return unload_ok
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
+    """Handle options update.
+
+    Every option can be applied in place, so the entry is not reloaded;
+    the device id, which would need new entities, is not an option.
+    """
+    coordinator: TaylorGrillCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_apply_options()
\ No newline at end of file
@@ -4,22 +4,17 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorDeviceClass,
 )
-from homeassistant.const import CONF_NAME
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.components import mqtt
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_ON, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 
-from .const import (
-    CONF_DEVICE_ID,
-    DOMAIN,
-    DEFAULT_NAME,
-    CONF_MANUFACTURER,
-    CONF_MODEL,
-    DEFAULT_MANUFACTURER,
-    DEFAULT_MODEL
-)
+from .const import DOMAIN, EVENT_STALL_ENDED, EVENT_STALL_STARTED
+from .coordinator import TaylorGrillCoordinator
+from .entity import TaylorGrillEntity
+from .history import StallDetector
+from .protocol import PACKET_STATUS, PACKET_TEMPS, StatusFrame, TempsFrame
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -91,79 +86,120 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Taylor Grill binary sensors."""
-    # Use custom name if set, otherwise fallback to default
-    device_name = entry.options.get(CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME))
-    device_id = entry.data[CONF_DEVICE_ID]
-    manufacturer = entry.options.get(CONF_MANUFACTURER, entry.data.get(CONF_MANUFACTURER, DEFAULT_MANUFACTURER))
-    model = entry.options.get(CONF_MODEL, entry.data.get(CONF_MODEL, DEFAULT_MODEL))
+    coordinator: TaylorGrillCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     entities = []
     for config in SENSORS_CONFIG:
-        entities.append(TaylorBinarySensor(hass, device_name, device_id, manufacturer, model, entry.entry_id, config))
-    
+        entities.append(TaylorBinarySensor(coordinator, entry.entry_id, config))
+    for index in (1, 2, 3):
+        entities.append(
+            TaylorStallSensor(coordinator, entry.entry_id, f"External Probe {index}", index)
+        )
+
     async_add_entities(entities)
 
 
-class TaylorBinarySensor(BinarySensorEntity):
+class TaylorBinarySensor(TaylorGrillEntity, BinarySensorEntity, RestoreEntity):
     """Representation of a Taylor Grill Binary Sensor."""
 
-    _attr_has_entity_name = True
-
-    def __init__(self, hass, device_name, device_id, manufacturer, model, entry_id, config):
-        self.hass = hass
-        self._device_name = device_name
-        self._device_id = device_id
+    def __init__(self, coordinator, entry_id, config):
+        super().__init__(coordinator)
         self._attr_name = config["name"]
-        self._manufacturer = manufacturer
-        self._model = model
         self._attr_unique_id = f"{entry_id}_{config['key']}"
         self._offset = config["offset"]
         self._attr_device_class = config["device_class"]
         self._attr_icon = config["icon"]
         self._is_on = False
-        
-        self._topic_state = f"{device_id}/dev2app"
 
     async def async_added_to_hass(self):
-        """Subscribe to MQTT."""
-        @callback
-        def message_received(message):
-            self._parse_packet(message.payload)
-
-        await mqtt.async_subscribe(
-            self.hass, self._topic_state, message_received, encoding=None
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is not None:
+            # Shown until the first status frame arrives
+            self._is_on = last_state.state == STATE_ON
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_STATUS, self._handle_status)
         )
 
+    @callback
+    def _handle_status(self, frame: StatusFrame):
+        """Handle a decoded status packet for errors."""
+        new_state = frame.flag(self._offset)
+        if self._is_on != new_state:
+            self._is_on = new_state
+            self.async_schedule_write()
+
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return information to link this entity with the device."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-            manufacturer=self._manufacturer,
-            model=self._model,
+    def is_on(self):
+        """Return true if the binary sensor is on."""
+        return self._is_on
+
+
+class TaylorStallSensor(TaylorGrillEntity, BinarySensorEntity):
+    """On while a meat probe is in the stall.
+
+    Entering and leaving the stall also fire taylor_grill_stall_started
+    and taylor_grill_stall_ended events for automations.
+    """
+
+    _attr_icon = "mdi:timer-pause-outline"
+
+    def __init__(self, coordinator, entry_id, probe_name, probe_index):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = f"{probe_name} Stall"
+        self._attr_unique_id = f"{entry_id}_probe_{probe_index}_stall"
+        self._probe_name = probe_name
+        self._probe_index = probe_index
+        self._history = coordinator.history[probe_index]
+        self._detector = StallDetector()
+        self._is_celsius = coordinator.temp_unit == UnitOfTemperature.CELSIUS
+        self._is_on = False
+
+    async def async_added_to_hass(self):
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_TEMPS, self._handle_temps)
         )
 
-    def _parse_packet(self, payload):
-        """Parse status packet for errors."""
-        if len(payload) < 6 or payload[0] != 0xFA:
-            return
-
-        if b'\xFE\x0B' in payload:
-            try:
-                idx = payload.find(b'\xFE\x0B')
-                # Check if we have enough data for this specific offset
-                if idx != -1 and idx + self._offset < len(payload):
-                    val = payload[idx + self._offset]
-                    new_state = (val == 1)
-                    
-                    if self._is_on != new_state:
-                        self._is_on = new_state
-                        self.async_write_ha_state()
-            except IndexError:
-                pass
+    @callback
+    def _handle_temps(self, frame: TempsFrame):
+        """Check the probe's rate of rise after the coordinator recorded the frame."""
+        value = frame.probes[self._probe_index]
+        rate = self._history.rate
+        if self._detector.update(self.coordinator.frame_time, value, rate):
+            self._fire_event(value, rate)
+        if self._is_on != self._detector.stalled:
+            self._is_on = self._detector.stalled
+            self.async_schedule_write()
+
+    @callback
+    def _handle_options_update(self):
+        """Report event temperatures in the current unit."""
+        self._is_celsius = self._options_celsius
+
+    @callback
+    def _fire_event(self, value_f, rate_f):
+        """Announce a stall or recovery edge on the event bus."""
+        if self._is_celsius:
+            temperature = round((value_f - 32) / 1.8, 1)
+            rate = round(rate_f / 1.8, 2)
+        else:
+            temperature = value_f
+            rate = round(rate_f, 2)
+        self.hass.bus.async_fire(
+            EVENT_STALL_STARTED if self._detector.stalled else EVENT_STALL_ENDED,
+            {
+                "device_id": self.device_entry.id if self.device_entry else None,
+                "entity_id": self.entity_id,
+                "probe": self._probe_name,
+                "temperature": temperature,
+                "rate": rate,
+            },
+        )
 
     @property
     def is_on(self):
-        """Return true if the binary sensor is on."""
-        return self._is_on
\ No newline at end of file
+        """Return true while the probe is stalled."""
+        return self._is_on
@@ -0,0 +1,123 @@
+"""Packet capture files for recording and replaying Taylor Grill traffic.
+
+A capture is an append-only binary file: an 8-byte magic header followed
+by records of ``<timestamp: float64> <direction: uint8> <length: uint16>``
+and the raw packet bytes, all little endian.
+
+This module has no Home Assistant dependency so it can be reused by tools.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+import struct
+import time
+from typing import BinaryIO
+
+CAPTURE_MAGIC = b"TGCAP\x00\x01\n"
+CAPTURE_SUFFIX = ".tgcap"
+
+_RECORD = struct.Struct("<dBH")
+
+Record = tuple[float, int, bytes]
+
+
+class CaptureWriter:
+    """Buffer packets in memory and append them to a capture file.
+
+    append() and drain() only touch the in-memory buffer and belong on the
+    event loop; write() and close() do file I/O and belong in an executor,
+    one call at a time and in the order their chunks were drained.
+    flush() combines drain() and write() for single-threaded callers.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the writer; the file is opened on first flush."""
+        self.path = path
+        self.records = 0
+        self._pending = bytearray()
+        self._file: BinaryIO | None = None
+
+    def append(self, direction: int, data: bytes, timestamp: float | None = None) -> None:
+        """Queue one packet."""
+        if timestamp is None:
+            timestamp = time.time()
+        self._pending += _RECORD.pack(timestamp, direction, len(data))
+        self._pending += data
+        self.records += 1
+
+    def drain(self) -> bytes:
+        """Return and clear the queued records."""
+        chunk = bytes(self._pending)
+        self._pending.clear()
+        return chunk
+
+    def write(self, chunk: bytes) -> None:
+        """Append drained records to the file, creating it if needed."""
+        if self._file is None:
+            self._file = open(self.path, "ab")  # noqa: SIM115
+            if self._file.tell() == 0:
+                self._file.write(CAPTURE_MAGIC)
+        if chunk:
+            self._file.write(chunk)
+        self._file.flush()
+
+    def flush(self) -> None:
+        """Write queued packets to disk."""
+        self.write(self.drain())
+
+    def close(self, chunk: bytes = b"") -> None:
+        """Write the last drained records and close the file."""
+        self.write(chunk)
+        self._file.close()
+        self._file = None
+
+
+def read_capture(path: str) -> Iterator[Record]:
+    """Yield (timestamp, direction, data) records from a capture file.
+
+    A truncated last record, e.g. from a crash while recording, is ignored.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a Taylor Grill capture")
+        data = file.read()
+
+    view = memoryview(data)
+    size = len(data)
+    pos = 0
+    header = _RECORD.size
+    while pos + header <= size:
+        timestamp, direction, length = _RECORD.unpack_from(view, pos)
+        pos += header
+        if pos + length > size:
+            break
+        yield timestamp, direction, bytes(view[pos : pos + length])
+        pos += length
+
+
+async def async_replay(
+    records: Iterable[Record],
+    handler: Callable[[int, bytes], Awaitable[None] | None],
+    speed: float = 1.0,
+) -> int:
+    """Feed records to handler, keeping their original spacing.
+
+    speed scales time (2.0 replays twice as fast); 0 replays as fast as
+    possible. Returns the number of records replayed.
+    """
+    count = 0
+    first: float | None = None
+    started = time.monotonic()
+    for timestamp, direction, data in records:
+        if first is None:
+            first = timestamp
+        if speed > 0:
+            delay = (timestamp - first) / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        result = handler(direction, data)
+        if result is not None:
+            await result
+        count += 1
+    return count
@@ -1,163 +1,140 @@
 """Climate platform for Taylor Grill."""
 import logging
-import asyncio
-from datetime import timedelta
 import voluptuous as vol
 
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import (
+    ATTR_CURRENT_TEMPERATURE,
     HVACMode,
     ClimateEntityFeature,
 )
 from homeassistant.const import (
-    CONF_NAME,
     ATTR_TEMPERATURE,
     UnitOfTemperature,
 )
-from homeassistant.components import mqtt
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util.unit_conversion import TemperatureConverter
 
-from .const import (
-    DOMAIN,
-    CONF_DEVICE_ID,
-    CONF_TEMP_UNIT,
-    DEFAULT_TEMP_UNIT,
-    DEFAULT_NAME,
-    CONF_MANUFACTURER,
-    CONF_MODEL,
-    DEFAULT_MANUFACTURER,
-    DEFAULT_MODEL
+from .commands import confirm_power, confirm_target
+from .const import DOMAIN
+from .coordinator import TaylorGrillCoordinator
+from .entity import TaylorGrillEntity
+from .protocol import (
+    CMD_OFF,
+    CMD_ON,
+    OPCODE_SET_TARGET,
+    PACKET_STATUS,
+    PACKET_TARGET,
+    PACKET_TEMPS,
+    StatusFrame,
+    TargetFrame,
+    TempsFrame,
+    encode_set_target,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-# --- COMMANDS ---
-CMD_ON = bytes.fromhex("fa06fe0101ff")
-CMD_OFF = bytes.fromhex("fa06fe0102ff")
-CMD_POLL_STATUS = bytes.fromhex("fa06fe0b01ff")
-CMD_POLL_TEMPS  = bytes.fromhex("fa06fe0e01ff")
-CMD_POLL_TARGET = bytes.fromhex("fa06fe0d01ff")
-CMD_HANDSHAKE   = bytes.fromhex("fa06fe5f01ff")
-
-# Standard QoS 0 is sufficient and reliable for this device
-MQTT_QOS_CMD = 0
-MQTT_RETAIN_CMD = False
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Taylor Grill climate platform."""
-    device_name = entry.options.get(CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME))
-    device_id = entry.data[CONF_DEVICE_ID]
-    manufacturer = entry.options.get(CONF_MANUFACTURER, entry.data.get(CONF_MANUFACTURER, DEFAULT_MANUFACTURER))
-    model = entry.options.get(CONF_MODEL, entry.data.get(CONF_MODEL, DEFAULT_MODEL))
-    
-    # Hardcoded to 2 seconds to match Android App heartbeat
-    poll_interval = 2
-    
-    temp_unit = entry.options.get(
-        CONF_TEMP_UNIT, entry.data.get(CONF_TEMP_UNIT, DEFAULT_TEMP_UNIT)
-    )
-    
-    smoker = TaylorSmoker(hass, device_name, device_id, manufacturer, model, entry.entry_id, poll_interval, temp_unit)
+    coordinator: TaylorGrillCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    smoker = TaylorSmoker(coordinator, entry.entry_id)
     async_add_entities([smoker])
 
 
-class TaylorSmoker(ClimateEntity):
+class TaylorSmoker(TaylorGrillEntity, ClimateEntity, RestoreEntity):
     """Representation of the Smoker."""
 
-    _attr_has_entity_name = True
     _attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT]
     _attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
 
-    def __init__(self, hass, device_name, device_id, manufacturer, model, unique_id, poll_interval, temp_unit):
-        self.hass = hass
-        self._attr_name = device_name
-        self._device_name = device_name
-        self._device_id = device_id
+    def __init__(self, coordinator, unique_id):
+        super().__init__(coordinator)
+        self._attr_name = coordinator.device_name
         self._attr_unique_id = unique_id
-        self._poll_interval = poll_interval
-        self._manufacturer = manufacturer
-        self._model = model
-        self._is_celsius = temp_unit == UnitOfTemperature.CELSIUS
-        
+        self._set_unit()
+        self._target_temp = 177 if self._is_celsius else 350
+
+        self._hvac_mode = HVACMode.OFF
+        # Mode shown before an on/off command the grill has not reported on yet
+        self._hvac_mode_before = None
+        self._current_temp = None
+
+        # Latest requested target not yet sent, and the last one the grill echoed (F)
+        self._pending_target_f = None
+        self._confirmed_target_f = None
+        self._target_debouncer = None
+
+    def _set_unit(self):
+        """Take the temperature unit and matching limits from the options."""
+        self._is_celsius = self._options_celsius
         if self._is_celsius:
             self._attr_temperature_unit = UnitOfTemperature.CELSIUS
             self._attr_min_temp = 82
             self._attr_max_temp = 260
             self._attr_target_temperature_step = 1
-            self._target_temp = 177
         else:
             self._attr_temperature_unit = UnitOfTemperature.FAHRENHEIT
             self._attr_min_temp = 180
             self._attr_max_temp = 500
             self._attr_target_temperature_step = 5
-            self._target_temp = 350
-
-        self._topic_cmd = f"{device_id}/app2dev"
-        self._topic_state = f"{device_id}/dev2app"
-        
-        self._hvac_mode = HVACMode.OFF
-        self._current_temp = None
     
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return information to link this entity with the device."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-            manufacturer=self._manufacturer,
-            model=self._model,
-    )
-
     async def async_added_to_hass(self):
-        """Subscribe to MQTT topics and start polling."""
-        @callback
-        def message_received(message):
-            self._parse_status(message.payload)
-
-        await mqtt.async_subscribe(
-            self.hass, self._topic_state, message_received, encoding=None
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._restore(last_state)
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_STATUS, self._handle_status)
         )
-        
-        # Initial Wakeup
-        await mqtt.async_publish(self.hass, self._topic_cmd, CMD_HANDSHAKE, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
-
         self.async_on_remove(
-            async_track_time_interval(
-                self.hass, self._run_poll_cycle, timedelta(seconds=self._poll_interval)
-            )
+            self.coordinator.async_add_listener(PACKET_TEMPS, self._handle_temps)
+        )
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_TARGET, self._handle_target)
         )
+        self.async_on_remove(self.coordinator.program.async_set_thermostat(self))
+        self.async_on_remove(
+            self.coordinator.program.async_add_listener(self.async_write_ha_state)
+        )
+        self._target_debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=self.coordinator.set_target_delay,
+            immediate=False,
+            function=self._async_send_target,
+        )
+        self.async_on_remove(self._target_debouncer.async_shutdown)
 
-    async def _run_poll_cycle(self, now=None):
-        """
-        Android App Heartbeat Sequence:
-        Handshake -> Status -> Temps -> Target
-        """
-        # 1. Unlock/Handshake
-        await mqtt.async_publish(self.hass, self._topic_cmd, CMD_HANDSHAKE, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
-        await asyncio.sleep(0.2)
-        
-        # 2. Poll Status (On/Off)
-        await mqtt.async_publish(self.hass, self._topic_cmd, CMD_POLL_STATUS, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
-        await asyncio.sleep(0.2)
-        
-        # 3. Poll Current Probes
-        await mqtt.async_publish(self.hass, self._topic_cmd, CMD_POLL_TEMPS, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
-        await asyncio.sleep(0.2)
-        
-        # 4. Poll Target Temp
-        await mqtt.async_publish(self.hass, self._topic_cmd, CMD_POLL_TARGET, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
+    def _restore(self, last_state):
+        """Show the last known mode and temperatures until the grill answers."""
+        if last_state.state in self._attr_hvac_modes:
+            self._hvac_mode = HVACMode(last_state.state)
+        # The state machine holds temperatures in the system unit
+        system_unit = self.hass.config.units.temperature_unit
+        for attribute, name in (
+            (ATTR_CURRENT_TEMPERATURE, "_current_temp"),
+            (ATTR_TEMPERATURE, "_target_temp"),
+        ):
+            value = last_state.attributes.get(attribute)
+            if not isinstance(value, (int, float)):
+                continue
+            value = TemperatureConverter.convert(
+                value, system_unit, self._attr_temperature_unit
+            )
+            setattr(self, name, round(value))
 
     async def async_set_temperature(self, **kwargs):
-        """Set new target temperature immediately."""
+        """Set a new target; calls within set_target_delay send only the latest."""
         if (temp := kwargs.get(ATTR_TEMPERATURE)) is None:
             return
         
@@ -167,123 +144,145 @@ class TaylorSmoker(ClimateEntity):
             target_f = int((target_val * 1.8) + 32)
         else:
             target_f = target_val
-        
-        range_byte = target_f // 100
-        offset_byte = (target_f % 100) // 10
-        units_byte = target_f % 10
-        
-        if range_byte > 5: range_byte = 5
-        if range_byte < 1: range_byte = 1
-        
-        # CRITICAL: Convert to immutable bytes() before sending
-        packet = bytes([0xFA, 0x09, 0xFE, 0x05, 0x01, range_byte, offset_byte, units_byte, 0xFF])
-        
-        _LOGGER.debug(f"User Changed Target Temp to {target_val} ({target_f}F). Sending MQTT RAW BYTES: {packet.hex()}")
-        await mqtt.async_publish(self.hass, self._topic_cmd, packet, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
-        
+        self._pending_target_f = target_f
+
         # Optimistically update the UI
         self._target_temp = target_val
         self.async_write_ha_state()
 
+        if self.coordinator.set_target_delay > 0:
+            await self._target_debouncer.async_call()
+        else:
+            await self._async_send_target()
+
+    async def _async_send_target(self):
+        """Send the latest requested target unless the grill already has it."""
+        target_f = self._pending_target_f
+        self._pending_target_f = None
+        if target_f is None:
+            return
+        packet = encode_set_target(target_f)
+        acks = self.coordinator.acks
+        # Compare with the target still on its way if there is one; the
+        # grill's echo of an earlier one says nothing about it
+        in_flight = acks.pending_packet(OPCODE_SET_TARGET)
+        if packet == in_flight or (in_flight is None and target_f == self._confirmed_target_f):
+            _LOGGER.debug("Target %sF is already set or being set on the grill; not sending", target_f)
+            return
+        if in_flight is not None:
+            # Stop resending the superseded target before the new one goes out
+            acks.async_cancel(in_flight)
+
+        _LOGGER.debug("User Changed Target Temp to %sF. Sending MQTT RAW BYTES: %s", target_f, packet.hex())
+        await self.coordinator.async_send_command(
+            packet, confirm_target(target_f), self._revert_target
+        )
+
+    @callback
+    def _revert_target(self):
+        """Show the grill's own target again after it ignored ours."""
+        if self._pending_target_f is not None or self._confirmed_target_f is None:
+            return
+        self._target_temp = self._target_from_f(self._confirmed_target_f)
+        self.async_write_ha_state()
+
     async def async_set_hvac_mode(self, hvac_mode):
         """Set ON/OFF immediately."""
         if hvac_mode == HVACMode.HEAT:
-            _LOGGER.debug(f"User turned Smoker ON. Sending: {CMD_ON.hex()}")
-            await mqtt.async_publish(self.hass, self._topic_cmd, CMD_ON, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
-            self._hvac_mode = HVACMode.HEAT
+            _LOGGER.debug("User turned Smoker ON. Sending: %s", CMD_ON.hex())
+            await self.coordinator.async_send_command(
+                CMD_ON, confirm_power(True), self._revert_hvac_mode
+            )
         else:
-            _LOGGER.debug(f"User turned Smoker OFF. Sending: {CMD_OFF.hex()}")
-            await mqtt.async_publish(self.hass, self._topic_cmd, CMD_OFF, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD)
-            self._hvac_mode = HVACMode.OFF
+            _LOGGER.debug("User turned Smoker OFF. Sending: %s", CMD_OFF.hex())
+            await self.coordinator.async_send_command(
+                CMD_OFF, confirm_power(False), self._revert_hvac_mode
+            )
+        if self._hvac_mode_before is None:
+            # ON and OFF replace each other in the tracker, so a command
+            # sent before the last one was confirmed keeps its saved mode
+            self._hvac_mode_before = self._hvac_mode
+        self._hvac_mode = HVACMode.HEAT if hvac_mode == HVACMode.HEAT else HVACMode.OFF
         self.async_write_ha_state()
 
-    def _parse_status(self, payload):
-        """Parse the binary status message."""
-        if len(payload) < 6 or payload[0] != 0xFA:
+    @callback
+    def _revert_hvac_mode(self):
+        """Show the mode from before the command the grill ignored."""
+        if self._hvac_mode_before is None:
+            # A status frame came in since; the mode shown is the grill's own
             return
+        self._hvac_mode = self._hvac_mode_before
+        self._hvac_mode_before = None
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_status(self, frame: StatusFrame):
+        """Handle a decoded status packet."""
+        hvac_mode = HVACMode.HEAT if frame.is_on else HVACMode.OFF
+        self._hvac_mode_before = None
+        if self._hvac_mode != hvac_mode:
+            _LOGGER.debug("Smoker reports Status: %s (Byte: %s)", hvac_mode, frame.state)
+            self._hvac_mode = hvac_mode
+            self.async_schedule_write()
+
+    @callback
+    def _handle_temps(self, frame: TempsFrame):
+        """Handle decoded probe temperatures."""
+        raw_int = frame.internal
+        if raw_int is None:
+            return
+
+        _LOGGER.debug("Smoker reports Internal Temp: %sF, Probe 1: %sF, Probe 2: %sF", *frame.probes[:3])
+
+        # Update Entity State (Internal Probe)
+        if self._is_celsius:
+            current_temp = round((raw_int - 32) / 1.8)
+        else:
+            current_temp = raw_int
+        if self._temp_changed(self._current_temp, current_temp):
+            self._current_temp = current_temp
+            self.async_schedule_write()
 
-        # --- Status Packet (0x0B) ---
-        if b'\xFE\x0B' in payload:
-            try:
-                idx = payload.find(b'\xFE\x0B')
-                if idx != -1 and idx + 3 < len(payload):
-                    state_byte = payload[idx + 3]
-                    # 0x02 is OFF. 0x01 (Startup) and 0x06 (Running) are ON.
-                    if state_byte == 0x02:
-                        if self._hvac_mode != HVACMode.OFF:
-                            _LOGGER.debug(f"Smoker reports Status: OFF (Byte: {state_byte})")
-                        self._hvac_mode = HVACMode.OFF
-                    else:
-                        if self._hvac_mode != HVACMode.HEAT:
-                            _LOGGER.debug(f"Smoker reports Status: ON (Byte: {state_byte})")
-                        self._hvac_mode = HVACMode.HEAT
-                    self.async_write_ha_state()
-            except IndexError:
-                pass
-
-        # --- Sensor Packet (0x0E) ---
-        if b'\xFE\x0E' in payload:
-            try:
-                idx = payload.find(b'\xFE\x0E')
-                # Parse up to 4 probes for logging
-                # Offset mapping: Internal(+20), P1(+23), P2(+26), P3(+29)
-                base = idx + 20
-                if base + 2 < len(payload):
-                    # Internal
-                    h, t, u = payload[base], payload[base+1], payload[base+2]
-                    raw_int = (h * 100) + (t * 10) + u
-                    
-                    # Log other probes if available
-                    log_msg = f"Smoker reports Internal Temp: {raw_int}F"
-                    
-                    # Try P1
-                    if base + 5 < len(payload):
-                        h1, t1, u1 = payload[base+3], payload[base+4], payload[base+5]
-                        raw_p1 = (h1 * 100) + (t1 * 10) + u1
-                        log_msg += f", Probe 1: {raw_p1}F"
-                        
-                    # Try P2
-                    if base + 8 < len(payload):
-                        h2, t2, u2 = payload[base+6], payload[base+7], payload[base+8]
-                        raw_p2 = (h2 * 100) + (t2 * 10) + u2
-                        log_msg += f", Probe 2: {raw_p2}F"
-
-                    _LOGGER.debug(log_msg)
-
-                    # Update Entity State (Internal Probe)
-                    if self._is_celsius:
-                        self._current_temp = round((raw_int - 32) / 1.8)
-                    else:
-                        self._current_temp = raw_int
-                    self.async_write_ha_state()
-            except (IndexError, ValueError):
-                pass
-
-        # --- Target Temp Packet (0x0D) ---
-        if b'\xFE\x0D' in payload:
-            try:
-                idx = payload.find(b'\xFE\x0D')
-                if idx != -1 and idx + 22 < len(payload):
-                    hundreds = payload[idx + 20]
-                    tens = payload[idx + 21]
-                    units = payload[idx + 22]
-                    
-                    if hundreds <= 9:
-                        raw_target = (hundreds * 100) + (tens * 10) + units
-                        
-                        if self._is_celsius:
-                            new_target = round((raw_target - 32) / 1.8)
-                        else:
-                            new_target = raw_target
-                        
-                        if new_target > 0:
-                            # Check if changed externally
-                            if self._target_temp != new_target:
-                                _LOGGER.debug(f"Target temp changed outside of HA (or confirmed). Updating UI. New temp: {new_target}")
-                                self._target_temp = new_target
-                                self.async_write_ha_state()
-            except (IndexError, ValueError):
-                pass
+    @callback
+    def _handle_target(self, frame: TargetFrame):
+        """Handle a decoded target temperature."""
+        raw_target = frame.target
+        self._confirmed_target_f = raw_target
+        if self._pending_target_f is not None:
+            # Keep showing the requested target until it has been sent
+            return
+        new_target = self._target_from_f(raw_target)
+
+        if new_target > 0:
+            # Check if changed externally
+            if self._target_temp != new_target:
+                _LOGGER.debug("Target temp changed outside of HA (or confirmed). Updating UI. New temp: %s", new_target)
+                self._target_temp = new_target
+                self.async_schedule_write()
+
+    @callback
+    def _handle_options_update(self):
+        """Apply a new name, unit or send delay."""
+        self._attr_name = self.coordinator.device_name
+        self._target_debouncer.cooldown = self.coordinator.set_target_delay
+        if self._is_celsius != self._options_celsius:
+            if self._confirmed_target_f is not None:
+                target_f = self._confirmed_target_f
+            elif self._is_celsius:
+                target_f = round(self._target_temp * 1.8 + 32)
+            else:
+                target_f = self._target_temp
+            self._set_unit()
+            self._target_temp = self._target_from_f(target_f)
+            latest = self.coordinator.history[0].latest
+            self._current_temp = None if latest is None else self._target_from_f(int(latest))
+        self.async_write_ha_state()
+
+    def _target_from_f(self, target_f):
+        """Convert a Fahrenheit target to the display unit."""
+        if self._is_celsius:
+            return round((target_f - 32) / 1.8)
+        return target_f
 
     @property
     def current_temperature(self):
@@ -296,3 +295,10 @@ class TaylorSmoker(ClimateEntity):
     @property
     def hvac_mode(self):
         return self._hvac_mode
+
+    @property
+    def extra_state_attributes(self):
+        """Return the running cook program, if any."""
+        if not self.coordinator.program.running:
+            return None
+        return {"program": self.coordinator.program.as_dict()}
@@ -0,0 +1,333 @@
+"""Response-paced command queue and acknowledgement tracking for Taylor Grill."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from functools import partial
+import logging
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .protocol import (
+    OPCODE_POWER,
+    OPCODE_SET_TARGET,
+    PACKET_STATUS,
+    PACKET_TARGET,
+    PACKET_TEMPS,
+    Frame,
+)
+from .stats import LinkStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long to wait for a response before sending the next command
+RESPONSE_TIMEOUT = 1.0
+# User commands beyond this are dropped (oldest first) if the device stalls
+MAX_USER_COMMANDS = 8
+
+# How long (s) a state-changing command may take to show up in a frame;
+# doubled on every retry
+ACK_TIMEOUT = 5.0
+# Resends before a command is given up and its optimistic state reverted
+ACK_RETRIES = 2
+
+# Command opcode -> opcode of the frame that answers it. The grill echoes
+# on/off and set-target with a status and a target frame; those echoes
+# must count as answers, or they would look like pushes to the scheduler.
+_RESPONSES = {
+    PACKET_STATUS: PACKET_STATUS,
+    PACKET_TEMPS: PACKET_TEMPS,
+    PACKET_TARGET: PACKET_TARGET,
+    OPCODE_POWER: PACKET_STATUS,
+    OPCODE_SET_TARGET: PACKET_TARGET,
+}
+
+
+class CommandQueue:
+    """Send one command at a time, moving on when its response arrives.
+
+    User commands always go ahead of polls. A poll that is already
+    pending is not queued twice, so a stalled device holds at most one
+    copy of each poll and MAX_USER_COMMANDS user commands.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[bytes], Awaitable[None]],
+        name: str,
+        timeout: float = RESPONSE_TIMEOUT,
+        stats: LinkStats | None = None,
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._send = send
+        self._name = name
+        self._timeout = timeout
+        self._stats = stats if stats is not None else LinkStats()
+        self._user: deque[tuple[bytes, asyncio.Future[None]]] = deque()
+        self._polls: dict[bytes, None] = {}
+        self._worker: asyncio.Task[None] | None = None
+        self._waiter: asyncio.Future[None] | None = None
+        self._expected: int | None = None
+        # Opcode -> monotonic deadline for a late answer to a timed-out poll
+        self._late: dict[int, float] = {}
+
+    @property
+    def polls_pending(self) -> bool:
+        """Return True while polls from an earlier cycle are still queued."""
+        return bool(self._polls)
+
+    @callback
+    def async_enqueue_poll(self, packet: bytes) -> None:
+        """Queue a poll unless the same poll is already pending."""
+        self._polls[packet] = None
+        self._ensure_worker()
+
+    @callback
+    def async_enqueue_user(self, packet: bytes) -> asyncio.Future[None]:
+        """Queue a user command ahead of polls; the future resolves once sent."""
+        if len(self._user) >= MAX_USER_COMMANDS:
+            _, dropped = self._user.popleft()
+            dropped.set_exception(
+                HomeAssistantError(f"{self._name} is not answering; command dropped")
+            )
+        sent = self.hass.loop.create_future()
+        self._user.append((packet, sent))
+        self._ensure_worker()
+        return sent
+
+    @callback
+    def async_response_received(self, opcode: int, now: float) -> bool:
+        """Release the queue if this frame answers the command in flight.
+
+        Returns False for a frame that answers no poll, i.e. a push.
+        """
+        if opcode == self._expected and self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+            return True
+        if self._late:
+            deadline = self._late.pop(opcode, None)
+            if deadline is not None and now < deadline:
+                return True
+        return False
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the worker and drop everything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        while self._user:
+            self._user.popleft()[1].cancel()
+        self._polls.clear()
+        self._late.clear()
+
+    @callback
+    def _ensure_worker(self) -> None:
+        """Start the worker if it is not running."""
+        if self._worker is None:
+            self._worker = self.hass.async_create_background_task(
+                self._async_run(), name=f"{self._name} command queue"
+            )
+
+    async def _async_run(self) -> None:
+        """Drain the queues, pacing each command on its response."""
+        try:
+            while True:
+                sent = None
+                if self._user:
+                    packet, sent = self._user.popleft()
+                elif self._polls:
+                    packet = next(iter(self._polls))
+                    del self._polls[packet]
+                else:
+                    return
+
+                try:
+                    await self._send(packet)
+                except Exception as err:  # pylint: disable=broad-except
+                    if sent is not None and not sent.done():
+                        sent.set_exception(err)
+                    else:
+                        _LOGGER.debug("Failed to send %s: %s", packet.hex(), err)
+                    continue
+                if sent is not None and not sent.done():
+                    sent.set_result(None)
+
+                expected = _RESPONSES.get(packet[3])
+                if expected is not None:
+                    await self._async_wait_for(expected)
+        finally:
+            self._worker = None
+
+    async def _async_wait_for(self, opcode: int) -> None:
+        """Wait for a frame with the given opcode, or the timeout."""
+        stats = self._stats
+        stats.polls += 1
+        self._expected = opcode
+        self._waiter = self.hass.loop.create_future()
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self._timeout):
+                await self._waiter
+        except TimeoutError:
+            stats.timeouts += 1
+            # An answer within another timeout is late, not a push
+            self._late[opcode] = time.monotonic() + self._timeout
+            _LOGGER.debug("%s: no response to opcode 0x%02X", self._name, opcode)
+        else:
+            stats.responses += 1
+            stats.response_ms.observe(int((time.monotonic() - start) * 1000))
+        finally:
+            self._expected = None
+            self._waiter = None
+
+
+def confirm_power(on: bool) -> Callable[[Frame], bool]:
+    """Return a check for a status frame reporting the smoker on or off."""
+    return lambda frame: frame.opcode == PACKET_STATUS and frame.is_on == on
+
+
+def confirm_target(target_f: int) -> Callable[[Frame], bool]:
+    """Return a check for a target frame echoing target_f."""
+    return lambda frame: frame.opcode == PACKET_TARGET and frame.target == target_f
+
+
+class _PendingCommand:
+    """A state-changing command waiting for its confirmation."""
+
+    __slots__ = ("packet", "confirm", "on_failure", "sent_at", "attempt", "cancel_timer")
+
+    def __init__(
+        self,
+        packet: bytes,
+        confirm: Callable[[Frame], bool],
+        on_failure: Callable[[], None] | None,
+    ) -> None:
+        """Initialize the pending command."""
+        self.packet = packet
+        self.confirm = confirm
+        self.on_failure = on_failure
+        # Monotonic time of the latest publish, None while still queued
+        self.sent_at: float | None = None
+        self.attempt = 0
+        self.cancel_timer: CALLBACK_TYPE | None = None
+
+
+class AckTracker:
+    """Follow state-changing commands until a decoded frame confirms them.
+
+    Commands go out with QoS 0, so a lost frame is only noticed when the
+    grill never reports the new state. Each command is resent with a
+    doubling timeout up to ACK_RETRIES times; after that on_failure is
+    called so the entity can revert its optimistic state. A newer command
+    with the same opcode replaces an older one still waiting.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, resend: Callable[[bytes], None], name: str
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._resend = resend
+        self._name = name
+        self._pending: dict[int, _PendingCommand] = {}
+        # Seconds from publishing a command to the frame confirming it
+        self.latency: float | None = None
+        self.confirmed = 0
+        self.retries = 0
+        self.failures = 0
+
+    @callback
+    def async_track(
+        self,
+        packet: bytes,
+        confirm: Callable[[Frame], bool],
+        on_failure: Callable[[], None] | None = None,
+    ) -> None:
+        """Start waiting for a frame for which confirm returns True."""
+        self.async_cancel(packet)
+        pending = _PendingCommand(packet, confirm, on_failure)
+        self._pending[packet[3]] = pending
+        self._schedule_timeout(pending)
+
+    def pending_packet(self, opcode: int) -> bytes | None:
+        """Return the unconfirmed command with this opcode, if any."""
+        pending = self._pending.get(opcode)
+        return pending.packet if pending is not None else None
+
+    @callback
+    def async_published(self, packet: bytes, now: float) -> None:
+        """Start the latency clock of a tracked command as it goes out.
+
+        Debounce and queue wait are left out, and a resend restarts the
+        clock, so latency is the grill's round trip.
+        """
+        pending = self._pending.get(packet[3])
+        if pending is not None and pending.packet == packet:
+            pending.sent_at = now
+
+    @callback
+    def async_cancel(self, packet: bytes) -> None:
+        """Stop tracking the command with this packet's opcode."""
+        if (pending := self._pending.pop(packet[3], None)) is not None:
+            pending.cancel_timer()
+
+    @callback
+    def async_frame_received(self, frame: Frame, now: float) -> None:
+        """Resolve every pending command the frame confirms."""
+        if not self._pending:
+            return
+        for opcode, pending in tuple(self._pending.items()):
+            if pending.confirm(frame):
+                pending.cancel_timer()
+                del self._pending[opcode]
+                if pending.sent_at is not None:
+                    self.latency = now - pending.sent_at
+                self.confirmed += 1
+
+    @callback
+    def async_stop(self) -> None:
+        """Forget all pending commands without reverting anything."""
+        for pending in self._pending.values():
+            pending.cancel_timer()
+        self._pending.clear()
+
+    @callback
+    def _schedule_timeout(self, pending: _PendingCommand) -> None:
+        """Arm the timeout of the current attempt."""
+        pending.cancel_timer = async_call_later(
+            self.hass,
+            ACK_TIMEOUT * 2**pending.attempt,
+            partial(self._async_timeout, pending),
+        )
+
+    @callback
+    def _async_timeout(self, pending: _PendingCommand, _now=None) -> None:
+        """Resend an unconfirmed command, or give up on it."""
+        if self._pending.get(pending.packet[3]) is not pending:
+            return
+        if pending.attempt < ACK_RETRIES:
+            pending.attempt += 1
+            self.retries += 1
+            _LOGGER.debug(
+                "%s: %s not confirmed, resending (attempt %s)",
+                self._name, pending.packet.hex(), pending.attempt + 1,
+            )
+            self._resend(pending.packet)
+            self._schedule_timeout(pending)
+            return
+
+        del self._pending[pending.packet[3]]
+        self.failures += 1
+        _LOGGER.warning(
+            "%s did not confirm command %s after %s attempts",
+            self._name, pending.packet.hex(), pending.attempt + 1,
+        )
+        if pending.on_failure is not None:
+            pending.on_failure()
@@ -9,6 +9,10 @@ from homeassistant.core import callback
 from homeassistant.const import CONF_NAME, UnitOfTemperature
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
@@ -22,8 +26,22 @@ from .const import (
     DEFAULT_TEMP_UNIT,
     CONF_MANUFACTURER,
     CONF_MODEL,
+    CONF_TEMP_DEADBAND,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_SET_TARGET_DELAY,
+    CONF_OFFLINE_TIMEOUT,
+    CONF_COOK_LOG,
+    CONF_PROBE_INTERVAL,
+    CONF_SIGNIFICANT_CHANGE,
     DEFAULT_MANUFACTURER,
-    DEFAULT_MODEL
+    DEFAULT_MODEL,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_SET_TARGET_DELAY,
+    DEFAULT_OFFLINE_TIMEOUT,
+    DEFAULT_COOK_LOG,
+    DEFAULT_PROBE_INTERVAL,
+    DEFAULT_SIGNIFICANT_CHANGE,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -127,6 +145,76 @@ class TaylorGrillOptionsFlowHandler(config_entries.OptionsFlow):
                         multiple=False
                     )
                 ),
+                vol.Optional(
+                    CONF_TEMP_DEADBAND,
+                    default=self._config_entry.options.get(
+                        CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND
+                    ),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0, max=10, step=0.5, mode=NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Optional(
+                    CONF_MIN_WRITE_INTERVAL,
+                    default=self._config_entry.options.get(
+                        CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+                    ),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0, max=60, step=1, mode=NumberSelectorMode.BOX,
+                        unit_of_measurement="s",
+                    )
+                ),
+                vol.Optional(
+                    CONF_SET_TARGET_DELAY,
+                    default=self._config_entry.options.get(
+                        CONF_SET_TARGET_DELAY, DEFAULT_SET_TARGET_DELAY
+                    ),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0, max=10, step=0.1, mode=NumberSelectorMode.BOX,
+                        unit_of_measurement="s",
+                    )
+                ),
+                vol.Optional(
+                    CONF_OFFLINE_TIMEOUT,
+                    default=self._config_entry.options.get(
+                        CONF_OFFLINE_TIMEOUT, DEFAULT_OFFLINE_TIMEOUT
+                    ),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=10, max=600, step=1, mode=NumberSelectorMode.BOX,
+                        unit_of_measurement="s",
+                    )
+                ),
+                vol.Optional(
+                    CONF_COOK_LOG,
+                    default=self._config_entry.options.get(
+                        CONF_COOK_LOG, DEFAULT_COOK_LOG
+                    ),
+                ): BooleanSelector(),
+                vol.Optional(
+                    CONF_PROBE_INTERVAL,
+                    default=self._config_entry.options.get(
+                        CONF_PROBE_INTERVAL, DEFAULT_PROBE_INTERVAL
+                    ),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0, max=3600, step=1, mode=NumberSelectorMode.BOX,
+                        unit_of_measurement="s",
+                    )
+                ),
+                vol.Optional(
+                    CONF_SIGNIFICANT_CHANGE,
+                    default=self._config_entry.options.get(
+                        CONF_SIGNIFICANT_CHANGE, DEFAULT_SIGNIFICANT_CHANGE
+                    ),
+                ): NumberSelector(
+                    NumberSelectorConfig(
+                        min=0.5, max=50, step=0.5, mode=NumberSelectorMode.BOX
+                    )
+                ),
             }
         )
 
@@ -3,14 +3,52 @@
 from homeassistant.const import UnitOfTemperature
 
 DOMAIN = "taylor_grill"
+# hass.data[DOMAIN] keys of the shared MQTT router and program timer wheel;
+# all other keys are entry ids
+DATA_ROUTER = "router"
+DATA_TIMERS = "timers"
 CONF_DEVICE_ID = "device_id"
 CONF_TEMP_UNIT = "temp_unit"
 CONF_NAME = "device_name"
 
 CONF_MANUFACTURER = "manufacturer"
 CONF_MODEL = "model"
+CONF_TEMP_DEADBAND = "temp_deadband"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_SET_TARGET_DELAY = "set_target_delay"
+CONF_OFFLINE_TIMEOUT = "offline_timeout"
+CONF_COOK_LOG = "cook_log"
+CONF_PROBE_INTERVAL = "probe_interval"
+CONF_SIGNIFICANT_CHANGE = "significant_change"
 
 DEFAULT_NAME = "Taylor Grill Smoker"
 DEFAULT_TEMP_UNIT = UnitOfTemperature.FAHRENHEIT
 DEFAULT_MANUFACTURER = "Taylor"
-DEFAULT_MODEL="SmartSmoker"
\ No newline at end of file
+DEFAULT_MODEL="SmartSmoker"
+# Temperature changes at or below this (in the display unit) are not written
+DEFAULT_TEMP_DEADBAND = 0
+# Minimum seconds between two state-write passes of one device
+DEFAULT_MIN_WRITE_INTERVAL = 0
+# Seconds to gather set-temperature calls before sending only the latest
+DEFAULT_SET_TARGET_DELAY = 1.0
+# Seconds without a valid frame before the grill's entities become unavailable
+DEFAULT_OFFLINE_TIMEOUT = 60
+# Write every probe reading of a cook to a cook log file
+DEFAULT_COOK_LOG = False
+# Seconds between probe state writes in downsampled mode (0 = off), and the
+# change (in the display unit) that is written right away regardless
+DEFAULT_PROBE_INTERVAL = 0
+DEFAULT_SIGNIFICANT_CHANGE = 5
+
+PROBE_NAMES = ["Internal Probe", "External Probe 1", "External Probe 2", "External Probe 3"]
+
+# Events fired when a meat probe enters and leaves the stall
+EVENT_STALL_STARTED = f"{DOMAIN}_stall_started"
+EVENT_STALL_ENDED = f"{DOMAIN}_stall_ended"
+# Events fired when a cook program enters a step and when it ends
+EVENT_PROGRAM_STEP = f"{DOMAIN}_program_step"
+EVENT_PROGRAM_FINISHED = f"{DOMAIN}_program_finished"
+
+# Standard QoS 0 is sufficient and reliable for this device
+MQTT_QOS_CMD = 0
+MQTT_RETAIN_CMD = False
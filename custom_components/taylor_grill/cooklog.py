@@ -0,0 +1,201 @@
+"""Per-cook probe logs for Taylor Grill.
+
+A cook log is an append-only binary file: an 8-byte magic header followed
+by fixed-width records of ``<timestamp: float64> <internal, P1, P2, P3,
+target: int16> <state: uint8> <flags: uint16>``, all little endian, with
+-1 for a missing value. One record is written per probe frame, so a cook
+keeps its full resolution at 21 bytes per reading.
+
+Fixed-width records let CookLog find a time range by binary search over
+a memory map instead of reading the whole file.
+
+This module has no Home Assistant dependency so it can be reused by tools.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, timezone
+import json
+import mmap
+import os
+import struct
+import time
+from typing import BinaryIO, TextIO
+
+COOK_LOG_MAGIC = b"TGCOOK\x01\n"
+COOK_LOG_SUFFIX = ".tgcook"
+
+_RECORD = struct.Struct("<d5hBH")
+_TIMESTAMP = struct.Struct("<d")
+_HEADER = len(COOK_LOG_MAGIC)
+_MISSING = -1
+
+COLUMNS = ("timestamp", "internal", "probe_1", "probe_2", "probe_3", "target", "state", "flags")
+
+# (timestamp, internal, P1, P2, P3, target, state, flags); temperatures in F
+CookRecord = tuple[float, int | None, int | None, int | None, int | None, int | None, int, int]
+
+
+class CookLogWriter:
+    """Buffer probe readings in memory and append them to a cook log.
+
+    The latest status and target are kept on the writer and stored with
+    every probe reading. append() and drain() only touch the in-memory
+    buffer and belong on the event loop; write() and close() do file I/O
+    and belong in an executor, one call at a time, since a record cut
+    short shifts every record after it.
+    """
+
+    def __init__(self, path: str, target: int | None = None) -> None:
+        """Initialize the writer; the file is opened on first write."""
+        self.path = path
+        self.records = 0
+        self.target = target
+        self.state = 0
+        self.flags = 0
+        self._pending = bytearray()
+        self._file: BinaryIO | None = None
+
+    def append(self, probes: tuple[int | None, ...], timestamp: float | None = None) -> None:
+        """Queue one reading of (internal, P1, P2, P3)."""
+        if timestamp is None:
+            timestamp = time.time()
+        internal, probe_1, probe_2, probe_3 = (
+            _MISSING if value is None else value for value in probes
+        )
+        self._pending += _RECORD.pack(
+            timestamp,
+            internal,
+            probe_1,
+            probe_2,
+            probe_3,
+            _MISSING if self.target is None else self.target,
+            self.state,
+            self.flags,
+        )
+        self.records += 1
+
+    def drain(self) -> bytes:
+        """Return and clear the queued records."""
+        chunk = bytes(self._pending)
+        self._pending.clear()
+        return chunk
+
+    def write(self, chunk: bytes) -> None:
+        """Append drained records to the file, creating it if needed."""
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "ab")  # noqa: SIM115
+            if self._file.tell() == 0:
+                self._file.write(COOK_LOG_MAGIC)
+        if chunk:
+            self._file.write(chunk)
+        self._file.flush()
+
+    def close(self, chunk: bytes = b"") -> None:
+        """Write the last drained records and close the file."""
+        self.write(chunk)
+        self._file.close()
+        self._file = None
+
+
+class CookLog:
+    """Read-only, memory-mapped view of a cook log.
+
+    Records are assumed to be in time order, as the writer produces them.
+    A truncated last record, e.g. from a crash while logging, is ignored.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Open and map a cook log."""
+        with open(path, "rb") as file:
+            if file.read(_HEADER) != COOK_LOG_MAGIC:
+                raise ValueError(f"{path} is not a Taylor Grill cook log")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self._count = (len(self._map) - _HEADER) // _RECORD.size
+
+    def __enter__(self) -> CookLog:
+        """Return the log for use in a with block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Unmap the file."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        """Return the number of complete records."""
+        return self._count
+
+    def _timestamp(self, index: int) -> float:
+        """Return the timestamp of one record."""
+        return _TIMESTAMP.unpack_from(self._map, _HEADER + index * _RECORD.size)[0]
+
+    def _bisect(self, timestamp: float) -> int:
+        """Return the index of the first record at or after timestamp."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamp(middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def records(self, start: float | None = None, end: float | None = None) -> Iterator[CookRecord]:
+        """Yield the records from start up to, not including, end (Unix time)."""
+        first = 0 if start is None else self._bisect(start)
+        last = self._count if end is None else self._bisect(end)
+        size = _RECORD.size
+        for offset in range(_HEADER + first * size, _HEADER + last * size, size):
+            timestamp, *temps, state, flags = _RECORD.unpack_from(self._map, offset)
+            yield (
+                timestamp,
+                *(None if value == _MISSING else value for value in temps),
+                state,
+                flags,
+            )
+
+
+def _iso(timestamp: float) -> str:
+    """Format a Unix timestamp as UTC ISO 8601."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def export_csv(
+    log: CookLog, file: TextIO, start: float | None = None, end: float | None = None
+) -> int:
+    """Write a time range of a cook log as CSV and return the number of rows."""
+    file.write(",".join(COLUMNS) + "\n")
+    count = 0
+    for timestamp, *values in log.records(start, end):
+        file.write(
+            ",".join([_iso(timestamp), *("" if value is None else str(value) for value in values)])
+            + "\n"
+        )
+        count += 1
+    return count
+
+
+def export_json(
+    log: CookLog, file: TextIO, start: float | None = None, end: float | None = None
+) -> int:
+    """Write a time range of a cook log as a JSON array and return its length.
+
+    Records are written one at a time, so exporting a long cook does not
+    build the whole document in memory.
+    """
+    file.write("[")
+    count = 0
+    for timestamp, *values in log.records(start, end):
+        if count:
+            file.write(",")
+        file.write("\n")
+        file.write(json.dumps(dict(zip(COLUMNS, [_iso(timestamp), *values]))))
+        count += 1
+    file.write("\n]\n")
+    return count
@@ -0,0 +1,624 @@
+"""Per-device MQTT coordinator for Taylor Grill."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components import mqtt
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import slugify
+
+from .capture import CaptureWriter
+from .commands import AckTracker, CommandQueue
+from .const import (
+    CONF_COOK_LOG,
+    CONF_DEVICE_ID,
+    CONF_MANUFACTURER,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_MODEL,
+    CONF_OFFLINE_TIMEOUT,
+    CONF_PROBE_INTERVAL,
+    CONF_SET_TARGET_DELAY,
+    CONF_SIGNIFICANT_CHANGE,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_UNIT,
+    DEFAULT_COOK_LOG,
+    DEFAULT_MANUFACTURER,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_MODEL,
+    DEFAULT_NAME,
+    DEFAULT_OFFLINE_TIMEOUT,
+    DEFAULT_PROBE_INTERVAL,
+    DEFAULT_SET_TARGET_DELAY,
+    DEFAULT_SIGNIFICANT_CHANGE,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_UNIT,
+    DOMAIN,
+    MQTT_QOS_CMD,
+    MQTT_RETAIN_CMD,
+)
+from .cooklog import COOK_LOG_SUFFIX, CookLogWriter
+from .history import BucketStats, ProbeHistory
+from .probe_statistics import async_import_hour
+from .program import ProgramRunner
+from .protocol import (
+    CMD_HANDSHAKE,
+    PACKET_STATUS,
+    PACKET_TARGET,
+    PACKET_TEMPS,
+    PROBE_OFFSETS,
+    Frame,
+    FrameSplitter,
+    StatusFrame,
+    TargetFrame,
+    TempsFrame,
+    decode_frame,
+)
+from .router import async_get_router
+from .scheduler import POLL_FAST, STARTUP_JITTER, PollScheduler
+from .stats import LinkStats
+from .trace import DIRECTION_RX, DIRECTION_TX, PacketTrace
+
+if TYPE_CHECKING:
+    from .entity import TaylorGrillEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_FLUSH_INTERVAL = timedelta(seconds=10)
+COOK_LOG_FLUSH_INTERVAL = timedelta(seconds=30)
+
+
+class TaylorGrillCoordinator:
+    """Receive the dev2app traffic of one smoker and fan frames out to entities.
+
+    Every frame is decoded exactly once here; entities register a callback
+    for the packet type they care about and receive the decoded frame.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self.entry = entry
+        self.device_id: str = entry.data[CONF_DEVICE_ID]
+        self.topic_cmd = f"{self.device_id}/app2dev"
+        # Start of generated file names; device ids may hold a /
+        self.file_prefix = slugify(self.device_id)
+
+        self._listeners: dict[int, list[Callable[[Frame], None]]] = {
+            PACKET_STATUS: [],
+            PACKET_TEMPS: [],
+            PACKET_TARGET: [],
+        }
+        self.trace = PacketTrace()
+        # Recent samples per probe (Fahrenheit), updated before listeners run
+        self.history = tuple(ProbeHistory() for _ in PROBE_OFFSETS)
+        # 5-minute and hourly summaries per probe, fed in downsampled mode only
+        self.buckets = tuple(BucketStats() for _ in PROBE_OFFSETS)
+        self._downsampling = bool(self.probe_interval)
+        # User-set probe targets (Fahrenheit) by probe index, from the number platform
+        self.probe_targets: dict[int, float] = {}
+        # Monotonic receive time of the frames being dispatched
+        self.frame_time = 0.0
+        # False once the grill stayed silent for offline_timeout
+        self.available = True
+        self._last_frame = 0.0
+        self._availability_listeners: list[CALLBACK_TYPE] = []
+        self._options_listeners: list[CALLBACK_TYPE] = []
+        self._capture: CaptureWriter | None = None
+        self._cancel_capture_flush: CALLBACK_TYPE | None = None
+        # Last queued capture or cook log file job; each job waits for the one before
+        self._file_job: asyncio.Task[None] | None = None
+        # Open while the grill is on and the cook log option is set
+        self._cook_logging: bool = self._option(CONF_COOK_LOG, DEFAULT_COOK_LOG)
+        self._cook_log: CookLogWriter | None = None
+        self._cook_target: int | None = None
+        self._cancel_cook_log_flush: CALLBACK_TYPE | None = None
+        self._splitter = FrameSplitter()
+        self._scheduler = PollScheduler()
+        self.stats = LinkStats(self._splitter)
+        self._queue = CommandQueue(hass, self.async_send, self.device_id, stats=self.stats)
+        self.acks = AckTracker(hass, self._async_resend, self.device_id)
+        self.program = ProgramRunner(hass, self)
+        self._unsubscribe: CALLBACK_TYPE | None = None
+        self._connect_task: asyncio.Task[None] | None = None
+        self._cancel_poll: CALLBACK_TYPE | None = None
+        # Monotonic time the armed poll timer fires
+        self._poll_at = 0.0
+        self._poll_job = HassJob(self._async_poll_cycle, cancel_on_shutdown=True)
+
+        self._dirty: dict[TaylorGrillEntity, None] = {}
+        self._flush_pending = False
+        self._last_flush = 0.0
+        self._cancel_flush: CALLBACK_TYPE | None = None
+        self._flush_job = HassJob(self._async_flush_writes, cancel_on_shutdown=True)
+
+    @property
+    def device_name(self) -> str:
+        """Return the configured device name."""
+        return self._option(CONF_NAME, DEFAULT_NAME)
+
+    @property
+    def manufacturer(self) -> str:
+        """Return the configured manufacturer."""
+        return self._option(CONF_MANUFACTURER, DEFAULT_MANUFACTURER)
+
+    @property
+    def model(self) -> str:
+        """Return the configured model."""
+        return self._option(CONF_MODEL, DEFAULT_MODEL)
+
+    @property
+    def temp_unit(self) -> str:
+        """Return the configured temperature unit."""
+        return self._option(CONF_TEMP_UNIT, DEFAULT_TEMP_UNIT)
+
+    @property
+    def temp_deadband(self) -> float:
+        """Return the temperature deadband in the display unit."""
+        return self._option(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)
+
+    @property
+    def min_write_interval(self) -> float:
+        """Return the minimum seconds between two state-write passes."""
+        return self._option(CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL)
+
+    @property
+    def set_target_delay(self) -> float:
+        """Return the seconds set-temperature calls are gathered before sending."""
+        return self._option(CONF_SET_TARGET_DELAY, DEFAULT_SET_TARGET_DELAY)
+
+    @property
+    def offline_timeout(self) -> float:
+        """Return the seconds of silence after which the grill counts as offline."""
+        return self._option(CONF_OFFLINE_TIMEOUT, DEFAULT_OFFLINE_TIMEOUT)
+
+    @property
+    def probe_interval(self) -> float:
+        """Return the seconds between probe state writes, 0 if not downsampling."""
+        return self._option(CONF_PROBE_INTERVAL, DEFAULT_PROBE_INTERVAL)
+
+    @property
+    def significant_change(self) -> float:
+        """Return the change written right away in downsampled mode."""
+        return self._option(CONF_SIGNIFICANT_CHANGE, DEFAULT_SIGNIFICANT_CHANGE)
+
+    def _option(self, key: str, default: Any) -> Any:
+        """Return an option, falling back to the initial config data."""
+        return self.entry.options.get(key, self.entry.data.get(key, default))
+
+    @callback
+    def async_start(self) -> None:
+        """Start connecting and polling without holding up setup.
+
+        Registering the route and the first handshake run in the
+        background; entities show their restored state until the grill
+        answers.
+        """
+        self._last_frame = time.monotonic()
+        self._connect_task = self.entry.async_create_background_task(
+            self.hass, self._async_connect(), f"{DOMAIN} connect {self.device_id}"
+        )
+
+    async def _async_connect(self) -> None:
+        """Register with the shared dev2app router and schedule the first poll."""
+        self._unsubscribe = await async_get_router(self.hass).async_register(
+            self.device_id, self._message_received
+        )
+        self._connect_task = None
+        # Initial Wakeup: the first cycle sends the handshake and every poll
+        self._schedule_poll(random.uniform(0, STARTUP_JITTER))
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop the route, queued commands, buffered data and all listeners."""
+        if self._connect_task is not None:
+            self._connect_task.cancel()
+            self._connect_task = None
+        if self._cancel_poll is not None:
+            self._cancel_poll()
+            self._cancel_poll = None
+        self.program.async_stop()
+        self._queue.async_stop()
+        self.acks.async_stop()
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        self._flush_pending = False
+        self._dirty.clear()
+        if self._capture is not None:
+            writer = self._capture
+            self._stop_capture()
+            self._async_file_job(writer.close, writer.drain())
+        self._stop_cook_log()
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._splitter.reset()
+        for listeners in self._listeners.values():
+            listeners.clear()
+        self._availability_listeners.clear()
+        self._options_listeners.clear()
+
+    @property
+    def polling(self) -> dict[str, Any]:
+        """Return the poll mode and learned push rates for diagnostics."""
+        return self._scheduler.as_dict(time.monotonic())
+
+    @property
+    def capture_path(self) -> str | None:
+        """Return the file currently being recorded to, if any."""
+        return self._capture.path if self._capture is not None else None
+
+    async def async_start_capture(self, path: str) -> None:
+        """Record every dev2app and app2dev packet to a capture file."""
+        if self._capture is not None:
+            await self.async_stop_capture()
+        writer = CaptureWriter(path)
+        await self._async_file_job(writer.write, writer.drain())
+        self._capture = writer
+        self._cancel_capture_flush = async_track_time_interval(
+            self.hass, self._async_flush_capture, CAPTURE_FLUSH_INTERVAL
+        )
+        _LOGGER.info("Recording %s traffic to %s", self.device_id, path)
+
+    async def async_stop_capture(self) -> int:
+        """Stop recording and return the number of packets captured."""
+        writer = self._capture
+        if writer is None:
+            return 0
+        self._stop_capture()
+        await self._async_file_job(writer.close, writer.drain())
+        _LOGGER.info("Captured %s packets to %s", writer.records, writer.path)
+        return writer.records
+
+    @callback
+    def _stop_capture(self) -> None:
+        """Detach the capture writer without touching the file."""
+        self._capture = None
+        if self._cancel_capture_flush is not None:
+            self._cancel_capture_flush()
+            self._cancel_capture_flush = None
+
+    async def _async_flush_capture(self, _now=None) -> None:
+        """Write buffered capture records in the executor."""
+        if (writer := self._capture) is not None:
+            await self._async_file_job(writer.write, writer.drain())
+
+    @callback
+    def _async_file_job(self, target: Callable[[bytes], None], chunk: bytes) -> asyncio.Task[None]:
+        """Run a writer's write or close in the executor after all earlier file jobs.
+
+        The chunk is drained on the event loop before this is called, so
+        running the jobs one after another keeps the records in order and
+        never writes to a file that a close has already run on.
+        """
+        previous = self._file_job
+
+        async def run() -> None:
+            if previous is not None:
+                # Only the order matters here; a failure is raised by its own task
+                await asyncio.wait((previous,))
+            await self.hass.async_add_executor_job(target, chunk)
+
+        self._file_job = self.hass.async_create_task(run(), f"{DOMAIN} file {self.device_id}")
+        return self._file_job
+
+    @property
+    def cook_log_path(self) -> str | None:
+        """Return the cook log being written, if any."""
+        return self._cook_log.path if self._cook_log is not None else None
+
+    @callback
+    def _record_cook(self, frame: StatusFrame | TargetFrame) -> None:
+        """Open a cook log when the grill turns on and close it when it turns off."""
+        writer = self._cook_log
+        if frame.opcode == PACKET_TARGET:
+            self._cook_target = frame.target
+            if writer is not None:
+                writer.target = frame.target
+            return
+        if writer is None:
+            if not frame.is_on:
+                return
+            filename = f"{self.file_prefix}_{datetime.now():%Y%m%d_%H%M%S}{COOK_LOG_SUFFIX}"
+            writer = self._cook_log = CookLogWriter(
+                self.hass.config.path(DOMAIN, filename), self._cook_target
+            )
+            self._cancel_cook_log_flush = async_track_time_interval(
+                self.hass, self._async_flush_cook_log, COOK_LOG_FLUSH_INTERVAL
+            )
+            _LOGGER.info("Logging %s cook to %s", self.device_id, writer.path)
+        elif not frame.is_on:
+            self._stop_cook_log()
+            return
+        writer.state = frame.state
+        writer.flags = frame.flags
+
+    @callback
+    def _stop_cook_log(self) -> None:
+        """Close the cook log in the executor."""
+        writer = self._cook_log
+        if writer is None:
+            return
+        self._cook_log = None
+        if self._cancel_cook_log_flush is not None:
+            self._cancel_cook_log_flush()
+            self._cancel_cook_log_flush = None
+        self._async_file_job(writer.close, writer.drain())
+        _LOGGER.info("Logged %s readings to %s", writer.records, writer.path)
+
+    async def _async_flush_cook_log(self, _now=None) -> None:
+        """Write buffered cook log records in the executor."""
+        if (writer := self._cook_log) is not None:
+            await self._async_file_job(writer.write, writer.drain())
+
+    async def async_flush_cook_log(self) -> None:
+        """Write everything logged so far, e.g. before an export."""
+        await self._async_flush_cook_log()
+        # A cook that just ended may still be closing
+        if self._file_job is not None:
+            await asyncio.wait((self._file_job,))
+
+    @callback
+    def async_add_listener(
+        self, packet_type: int, update_callback: Callable[[Frame], None]
+    ) -> CALLBACK_TYPE:
+        """Register a callback for one packet type and return its remover."""
+        return self._add_to(self._listeners[packet_type], update_callback)
+
+    @callback
+    def async_add_availability_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Register a callback for when the grill goes offline or comes back."""
+        return self._add_to(self._availability_listeners, update_callback)
+
+    @callback
+    def async_add_options_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Register a callback for when the entry options change."""
+        return self._add_to(self._options_listeners, update_callback)
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply changed options without reloading the entry.
+
+        Options are read through properties, so most take effect by
+        themselves; the device registry and entities that cache a name
+        or unit are updated here. Fresh frames are polled right away so
+        every value is soon shown in a new unit.
+        """
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, self.device_id)})
+        if device is not None:
+            device_registry.async_update_device(
+                device.id,
+                name=self.device_name,
+                manufacturer=self.manufacturer,
+                model=self.model,
+            )
+        if self._downsampling and not self.probe_interval:
+            self.buckets = tuple(BucketStats() for _ in PROBE_OFFSETS)
+        self._downsampling = bool(self.probe_interval)
+        self._cook_logging = self._option(CONF_COOK_LOG, DEFAULT_COOK_LOG)
+        if not self._cook_logging:
+            self._stop_cook_log()
+        for update_callback in tuple(self._options_listeners):
+            update_callback()
+        if self._unsubscribe is not None:
+            now = time.monotonic()
+            self._scheduler.hold_fast(now)
+            self._schedule_poll(0)
+
+    @staticmethod
+    def _add_to(listeners: list, update_callback: Callable) -> CALLBACK_TYPE:
+        """Append a callback to a listener list and return its remover."""
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_set_available(self, available: bool) -> None:
+        """Flip availability and let every entity write its state."""
+        self.available = available
+        if available:
+            _LOGGER.info("%s is answering again", self.device_id)
+        else:
+            _LOGGER.warning(
+                "%s sent nothing for %s s; marking it unavailable",
+                self.device_id, self.offline_timeout,
+            )
+        for update_callback in tuple(self._availability_listeners):
+            update_callback()
+
+    @callback
+    def async_schedule_write(self, entity: TaylorGrillEntity) -> None:
+        """Mark an entity dirty; all dirty entities are written in one pass.
+
+        The pass runs after the current payload has been fully dispatched,
+        and no sooner than min_write_interval after the previous pass.
+        """
+        self._dirty[entity] = None
+        if self._flush_pending:
+            return
+        self._flush_pending = True
+        delay = self._last_flush + self.min_write_interval - time.monotonic()
+        if delay > 0:
+            self._cancel_flush = async_call_later(self.hass, delay, self._flush_job)
+        else:
+            self.hass.loop.call_soon(self._async_flush_writes)
+
+    @callback
+    def async_discard_write(self, entity: TaylorGrillEntity) -> None:
+        """Forget a pending write, e.g. when the entity is removed."""
+        self._dirty.pop(entity, None)
+
+    @callback
+    def _async_flush_writes(self, _now=None) -> None:
+        """Write the state of every dirty entity."""
+        self._cancel_flush = None
+        if not self._flush_pending:
+            return
+        self._flush_pending = False
+        self._last_flush = time.monotonic()
+        dirty = self._dirty
+        self._dirty = {}
+        for entity in dirty:
+            entity.async_write_ha_state()
+
+    async def async_send(self, packet: bytes) -> None:
+        """Publish a raw command to the device."""
+        self.trace.record(DIRECTION_TX, packet)
+        if self._capture is not None:
+            self._capture.append(DIRECTION_TX, packet)
+        self.acks.async_published(packet, time.monotonic())
+        await mqtt.async_publish(
+            self.hass, self.topic_cmd, packet, qos=MQTT_QOS_CMD, retain=MQTT_RETAIN_CMD
+        )
+
+    async def async_send_command(
+        self,
+        packet: bytes,
+        confirm: Callable[[Frame], bool] | None = None,
+        on_failure: Callable[[], None] | None = None,
+    ) -> None:
+        """Send a user command ahead of any polls and poll fast until its effect is seen.
+
+        With confirm, the command is resent until a frame satisfies it;
+        on_failure is called if none does after all retries.
+        """
+        sent = self._async_enqueue_command(packet)
+        if confirm is not None:
+            self.acks.async_track(packet, confirm, on_failure)
+        try:
+            await sent
+        except Exception:
+            if confirm is not None:
+                self.acks.async_cancel(packet)
+            raise
+
+    @callback
+    def _async_resend(self, packet: bytes) -> None:
+        """Queue an unconfirmed command again."""
+        sent = self._async_enqueue_command(packet)
+        # A failed resend is reported by the tracker once it gives up
+        sent.add_done_callback(lambda fut: fut.cancelled() or fut.exception())
+
+    @callback
+    def _async_enqueue_command(self, packet: bytes) -> asyncio.Future[None]:
+        """Queue a user command and poll fast so its effect is seen soon."""
+        sent = self._queue.async_enqueue_user(packet)
+        now = time.monotonic()
+        self._scheduler.hold_fast(now)
+        # Never later: a burst of commands must not keep postponing the
+        # polls their confirmations depend on
+        self._schedule_poll(self._scheduler.interval(now), earlier_only=True)
+        return sent
+
+    @callback
+    def _schedule_poll(self, delay: float, earlier_only: bool = False) -> None:
+        """(Re)arm the poll timer; with earlier_only, only move it forward."""
+        now = time.monotonic()
+        if self._cancel_poll is not None:
+            if earlier_only and self._poll_at <= now + delay:
+                return
+            self._cancel_poll()
+        self._poll_at = now + delay
+        self._cancel_poll = async_call_later(self.hass, delay, self._poll_job)
+
+    @callback
+    def _async_poll_cycle(self, _now=None) -> None:
+        """
+        Android App Heartbeat Sequence:
+        Handshake -> Status -> Temps -> Target
+
+        Only the polls whose data is stale are queued, and the next cycle is
+        scheduled from the device state. The queue sends each poll as soon
+        as the previous one is answered. A cycle is skipped while polls
+        from the last one are still waiting, so cycles never overlap.
+        """
+        self._cancel_poll = None
+        now = time.monotonic()
+        if now - self._last_frame >= self.offline_timeout:
+            if self.available:
+                self._async_set_available(False)
+            self._scheduler.back_off()
+        if not self._queue.polls_pending:
+            commands = self._scheduler.due(now)
+            if commands:
+                self._queue.async_enqueue_poll(CMD_HANDSHAKE)
+                for command in commands:
+                    self._queue.async_enqueue_poll(command)
+        if self._unsubscribe is not None:
+            self._schedule_poll(self._scheduler.interval(now))
+
+    @callback
+    def _message_received(self, message: mqtt.ReceiveMessage) -> None:
+        """Handle a dev2app payload from the broker."""
+        payload = message.payload
+        self.trace.record(DIRECTION_RX, payload)
+        if self._capture is not None:
+            self._capture.append(DIRECTION_RX, payload)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("RAW MQTT PACKET: %s", payload.hex())
+        self.async_feed(payload)
+
+    @callback
+    def async_feed(self, payload: bytes) -> None:
+        """Decode each frame once and push the result to interested entities.
+
+        Live traffic and replayed captures both enter here.
+        """
+        now = self.frame_time = time.monotonic()
+        stats = self.stats
+        for raw in self._splitter.feed(payload):
+            start = time.perf_counter_ns()
+            frame = decode_frame(raw)
+            stats.parse_ns.observe(time.perf_counter_ns() - start)
+            if frame is None:
+                stats.count_undecoded(raw)
+                continue
+            stats.frames[frame.opcode] += 1
+            self._last_frame = now
+            if not self.available:
+                self._async_set_available(True)
+                # Leave the offline backoff right away
+                self._schedule_poll(POLL_FAST)
+            self._scheduler.observe(
+                frame, now, self._queue.async_response_received(frame.opcode, now)
+            )
+            self.acks.async_frame_received(frame, now)
+            if frame.opcode == PACKET_TEMPS:
+                self._record_temps(frame, now)
+            elif self._cook_logging:
+                self._record_cook(frame)
+            for update_callback in tuple(self._listeners[frame.opcode]):
+                update_callback(frame)
+
+    @callback
+    def _record_temps(self, frame: TempsFrame, now: float) -> None:
+        """Add probe readings to their history; an unplugged probe starts over."""
+        for history, value in zip(self.history, frame.probes):
+            if value is None:
+                if len(history):
+                    history.reset()
+            else:
+                history.add(now, value)
+        if self._cook_log is not None:
+            self._cook_log.append(frame.probes)
+        if self._downsampling:
+            timestamp = time.time()
+            for index, (buckets, value) in enumerate(zip(self.buckets, frame.probes)):
+                if value is not None and (hour := buckets.add(timestamp, value)):
+                    async_import_hour(self.hass, self.device_id, self.device_name, index, hour)
@@ -0,0 +1,34 @@
+"""Diagnostics support for Taylor Grill."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_DEVICE_ID, DOMAIN
+from .coordinator import TaylorGrillCoordinator
+
+TO_REDACT = {CONF_DEVICE_ID, "unique_id", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: TaylorGrillCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "link": coordinator.stats.as_dict(),
+        "polling": coordinator.polling,
+        "program": coordinator.program.as_dict(),
+        "commands": {
+            "latency": coordinator.acks.latency,
+            "confirmed": coordinator.acks.confirmed,
+            "retries": coordinator.acks.retries,
+            "failures": coordinator.acks.failures,
+        },
+        "trace": coordinator.trace.as_list(),
+    }
@@ -0,0 +1,82 @@
+"""Base entity for Taylor Grill."""
+from __future__ import annotations
+
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+
+from .const import DOMAIN
+from .coordinator import TaylorGrillCoordinator
+
+
+class TaylorGrillEntity(Entity):
+    """Common base for entities fed by a TaylorGrillCoordinator."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    # Frame time of the last temperature _temp_changed let through
+    _last_temp_write = 0.0
+
+    def __init__(self, coordinator: TaylorGrillCoordinator) -> None:
+        """Initialize the entity."""
+        self.coordinator = coordinator
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the grill's availability and drop pending writes on removal."""
+        await super().async_added_to_hass()
+        self.async_on_remove(lambda: self.coordinator.async_discard_write(self))
+        self.async_on_remove(
+            self.coordinator.async_add_availability_listener(self.async_schedule_write)
+        )
+        self.async_on_remove(
+            self.coordinator.async_add_options_listener(self._handle_options_update)
+        )
+
+    @callback
+    def async_schedule_write(self) -> None:
+        """Write state in the coordinator's next coalesced pass."""
+        self.coordinator.async_schedule_write(self)
+
+    @callback
+    def _handle_options_update(self) -> None:
+        """Pick up changed options; entities that cache a name or unit override this."""
+
+    @property
+    def _options_celsius(self) -> bool:
+        """Return True if the options now ask for Celsius."""
+        return self.coordinator.temp_unit == UnitOfTemperature.CELSIUS
+
+    def _temp_changed(self, old: float | None, new: float | None) -> bool:
+        """Return True if a temperature moved beyond the configured deadband.
+
+        In downsampled mode a change is only let through once per probe
+        interval, unless it is at least the significant change.
+        """
+        if old is None or new is None:
+            return old is not new
+        coordinator = self.coordinator
+        change = abs(new - old)
+        if change <= coordinator.temp_deadband:
+            return False
+        if interval := coordinator.probe_interval:
+            now = coordinator.frame_time
+            if change < coordinator.significant_change and now - self._last_temp_write < interval:
+                return False
+            self._last_temp_write = now
+        return True
+
+    @property
+    def available(self) -> bool:
+        """Return False while the grill is not answering."""
+        return self.coordinator.available
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return information to link this entity with the device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.device_id)},
+            name=self.coordinator.device_name,
+            manufacturer=self.coordinator.manufacturer,
+            model=self.coordinator.model,
+        )
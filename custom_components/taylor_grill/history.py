@@ -0,0 +1,366 @@
+"""Rolling probe statistics for Taylor Grill.
+
+Each probe keeps its recent samples in a fixed-size ring buffer backed by
+two arrays, plus running sums and monotonic index queues, so adding a
+sample and reading any statistic is O(1) (amortized) however long the
+cook runs. TrendEstimator predicts when a probe reaches a target and
+StallDetector spots the stall from the same samples, also in constant
+time and memory. BucketStats condenses full-rate samples into 5-minute
+and hourly mean/min/max for installs that write probes to the recorder
+less often.
+
+This module has no Home Assistant dependency so it can be reused by tools.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import deque
+import math
+
+# Samples kept per probe; at the fastest poll rate this covers ~34 minutes
+HISTORY_SIZE = 1024
+# Seconds of samples behind min/max/average
+STATS_WINDOW = 1800.0
+# Seconds of samples behind the rate of rise
+RATE_WINDOW = 600.0
+# No rate is reported until the samples span at least this many seconds
+MIN_RATE_SPAN = 60.0
+
+# Time constants (s) of the smoothed level and trend used for predictions
+LEVEL_TAU = 60.0
+TREND_TAU = 1200.0
+# Below this rise (degrees per minute) no finish time is predicted
+MIN_TREND = 0.01
+# Predictions further out than this (s) are not reported
+MAX_ETA = 24 * 3600.0
+
+# A probe at or above STALL_MIN_TEMP (F) whose rate of rise stays below
+# STALL_ENTER_RATE (F/min) for STALL_ENTER_TIME (s) is stalled, until the
+# rate stays above STALL_EXIT_RATE for STALL_EXIT_TIME. The gap between
+# the rates and the hold times keep 1F probe steps from flapping it.
+STALL_MIN_TEMP = 140.0
+STALL_ENTER_RATE = 0.05
+STALL_EXIT_RATE = 0.15
+STALL_ENTER_TIME = 900.0
+STALL_EXIT_TIME = 600.0
+
+# Length (s) of the short buckets kept for display, how many are kept,
+# and the length of the long buckets handed to long-term statistics
+BUCKET_SECONDS = 300
+BUCKETS_KEPT = 12
+HOUR_SECONDS = 3600
+
+# (start as Unix time, mean, minimum, maximum)
+Bucket = tuple[float, float, float, float]
+
+
+class ProbeHistory:
+    """Timestamped samples of one probe with rolling statistics.
+
+    Values are stored as given (the coordinator uses Fahrenheit); the rate
+    is a least-squares slope over RATE_WINDOW, in degrees per minute. The
+    rate window never reaches back further than the stats window or the
+    buffer.
+    """
+
+    __slots__ = (
+        "_size", "_stats_window", "_rate_window", "_times", "_values",
+        "_next", "_start", "_rate_start", "_sum", "_min", "_max",
+        "_origin", "_n", "_st", "_sv", "_stt", "_stv",
+    )
+
+    def __init__(
+        self,
+        size: int = HISTORY_SIZE,
+        stats_window: float = STATS_WINDOW,
+        rate_window: float = RATE_WINDOW,
+    ) -> None:
+        """Initialize an empty history."""
+        self._size = size
+        self._stats_window = stats_window
+        self._rate_window = rate_window
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all samples, e.g. when the probe is unplugged."""
+        # Sequence numbers: _start/_rate_start are the oldest samples in the
+        # stats/rate windows, _next is the next one to be written
+        self._next = 0
+        self._start = 0
+        self._rate_start = 0
+        self._sum = 0.0
+        # Sequence numbers with increasing/decreasing values
+        self._min: deque[int] = deque()
+        self._max: deque[int] = deque()
+        # Least-squares sums over the rate window, time relative to _origin
+        self._origin: float | None = None
+        self._n = 0
+        self._st = self._sv = self._stt = self._stv = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the stats window."""
+        return self._next - self._start
+
+    def add(self, now: float, value: float) -> None:
+        """Append a sample taken at monotonic time now."""
+        size = self._size
+        if self._next - self._start == size:
+            # Buffer full: the oldest sample is about to be overwritten
+            self._evict_stats()
+
+        if self._origin is None:
+            self._origin = now
+        seq = self._next
+        slot = seq % size
+        values = self._values
+        self._times[slot] = now
+        values[slot] = value
+        self._next = seq + 1
+
+        self._sum += value
+        minimum = self._min
+        while minimum and values[minimum[-1] % size] >= value:
+            minimum.pop()
+        minimum.append(seq)
+        maximum = self._max
+        while maximum and values[maximum[-1] % size] <= value:
+            maximum.pop()
+        maximum.append(seq)
+
+        t = now - self._origin
+        self._n += 1
+        self._st += t
+        self._sv += value
+        self._stt += t * t
+        self._stv += t * value
+
+        times = self._times
+        cutoff = now - self._rate_window
+        while times[self._rate_start % size] < cutoff:
+            self._evict_rate()
+        cutoff = now - self._stats_window
+        while times[self._start % size] < cutoff:
+            self._evict_stats()
+
+    def _evict_rate(self) -> None:
+        """Drop the oldest sample from the rate window."""
+        slot = self._rate_start % self._size
+        t = self._times[slot] - self._origin
+        value = self._values[slot]
+        self._n -= 1
+        self._st -= t
+        self._sv -= value
+        self._stt -= t * t
+        self._stv -= t * value
+        self._rate_start += 1
+
+    def _evict_stats(self) -> None:
+        """Drop the oldest sample from the stats window."""
+        seq = self._start
+        if self._rate_start == seq:
+            # The rate window never reaches further back than the buffer
+            self._evict_rate()
+        self._sum -= self._values[seq % self._size]
+        if self._min[0] == seq:
+            self._min.popleft()
+        if self._max[0] == seq:
+            self._max.popleft()
+        self._start = seq + 1
+
+    @property
+    def latest(self) -> float | None:
+        """Return the newest value."""
+        if self._next == self._start:
+            return None
+        return self._values[(self._next - 1) % self._size]
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest value in the stats window."""
+        return self._values[self._min[0] % self._size] if self._min else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest value in the stats window."""
+        return self._values[self._max[0] % self._size] if self._max else None
+
+    @property
+    def average(self) -> float | None:
+        """Return the mean value in the stats window."""
+        count = self._next - self._start
+        return self._sum / count if count else None
+
+    @property
+    def span(self) -> float:
+        """Return the seconds covered by the rate window."""
+        if self._n < 2:
+            return 0.0
+        size = self._size
+        return self._times[(self._next - 1) % size] - self._times[self._rate_start % size]
+
+    @property
+    def rate(self) -> float | None:
+        """Return the least-squares slope in degrees per minute."""
+        if self.span < MIN_RATE_SPAN:
+            return None
+        n = self._n
+        denominator = n * self._stt - self._st * self._st
+        if denominator <= 0:
+            return None
+        return (n * self._stv - self._st * self._sv) / denominator * 60
+
+
+class TrendEstimator:
+    """Holt double exponential smoothing over irregularly spaced samples.
+
+    The smoothing factors are derived from the time since the previous
+    sample, so a slow poll rate weighs each sample more instead of
+    stretching the time constants.
+    """
+
+    __slots__ = ("_level_tau", "_trend_tau", "_time", "level", "trend")
+
+    def __init__(self, level_tau: float = LEVEL_TAU, trend_tau: float = TREND_TAU) -> None:
+        """Initialize an empty estimator."""
+        self._level_tau = level_tau
+        self._trend_tau = trend_tau
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the current estimate."""
+        self._time: float | None = None
+        self.level: float | None = None
+        # Degrees per second
+        self.trend = 0.0
+
+    def add(self, now: float, value: float) -> None:
+        """Update the estimate with a sample taken at monotonic time now."""
+        if self._time is None:
+            self._time = now
+            self.level = value
+            return
+        dt = now - self._time
+        if dt <= 0:
+            return
+        self._time = now
+        alpha = 1 - math.exp(-dt / self._level_tau)
+        beta = 1 - math.exp(-dt / self._trend_tau)
+        predicted = self.level + self.trend * dt
+        level = predicted + alpha * (value - predicted)
+        self.trend += beta * ((level - self.level) / dt - self.trend)
+        self.level = level
+
+    def eta(self, target: float) -> float | None:
+        """Return the seconds until target is reached, 0 if already there."""
+        if self.level is None:
+            return None
+        if self.level >= target:
+            return 0.0
+        if self.trend * 60 < MIN_TREND:
+            return None
+        seconds = (target - self.level) / self.trend
+        return seconds if seconds <= MAX_ETA else None
+
+
+class StallDetector:
+    """Track the stall of one meat probe from its rate of rise, with hysteresis."""
+
+    __slots__ = ("stalled", "_since")
+
+    def __init__(self) -> None:
+        """Initialize the detector."""
+        self.stalled = False
+        # When the readings first disagreed with the current state
+        self._since: float | None = None
+
+    def update(self, now: float, value: float | None, rate: float | None) -> bool:
+        """Feed the latest reading and rate; return True on a stall or recovery edge."""
+        if value is None:
+            # Unplugged: not stalled, but this is no recovery either
+            self.stalled = False
+            self._since = None
+            return False
+        if rate is None:
+            return False
+        if self.stalled:
+            flip = rate > STALL_EXIT_RATE
+            hold = STALL_EXIT_TIME
+        else:
+            flip = value >= STALL_MIN_TEMP and rate < STALL_ENTER_RATE
+            hold = STALL_ENTER_TIME
+        if not flip:
+            self._since = None
+            return False
+        if self._since is None:
+            self._since = now
+        if now - self._since < hold:
+            return False
+        self.stalled = not self.stalled
+        self._since = None
+        return True
+
+
+class _Accumulator:
+    """Running mean/min/max of one time bucket."""
+
+    __slots__ = ("start", "count", "total", "minimum", "maximum")
+
+    def __init__(self, start: float, value: float) -> None:
+        """Start a bucket with its first sample."""
+        self.start = start
+        self.count = 1
+        self.total = value
+        self.minimum = value
+        self.maximum = value
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        elif value > self.maximum:
+            self.maximum = value
+
+    def close(self) -> Bucket:
+        """Return the finished bucket."""
+        return self.start, self.total / self.count, self.minimum, self.maximum
+
+
+class BucketStats:
+    """Mean, minimum and maximum of one probe per clock-aligned bucket.
+
+    Timestamps are Unix time so buckets line up with the wall clock, as
+    long-term statistics require. A bucket is closed by the first sample
+    after it, so a gap in readings leaves no empty buckets.
+    """
+
+    __slots__ = ("_bucket", "_hour", "buckets")
+
+    def __init__(self, kept: int = BUCKETS_KEPT) -> None:
+        """Initialize without samples."""
+        self._bucket: _Accumulator | None = None
+        self._hour: _Accumulator | None = None
+        # Most recent finished short buckets, oldest first
+        self.buckets: deque[Bucket] = deque(maxlen=kept)
+
+    def add(self, timestamp: float, value: float) -> Bucket | None:
+        """Add a sample; return the hour it closed, if any."""
+        start = timestamp - timestamp % BUCKET_SECONDS
+        bucket = self._bucket
+        if bucket is not None and bucket.start == start:
+            bucket.add(value)
+        else:
+            if bucket is not None:
+                self.buckets.append(bucket.close())
+            self._bucket = _Accumulator(start, value)
+
+        start = timestamp - timestamp % HOUR_SECONDS
+        hour = self._hour
+        if hour is not None and hour.start == start:
+            hour.add(value)
+            return None
+        self._hour = _Accumulator(start, value)
+        return hour.close() if hour is not None else None
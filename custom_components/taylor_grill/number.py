@@ -0,0 +1,108 @@
+"""Number platform for Taylor Grill."""
+import logging
+
+from homeassistant.components.number import NumberDeviceClass, NumberMode, RestoreNumber
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import TaylorGrillCoordinator
+from .entity import TaylorGrillEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Taylor Grill probe targets."""
+    coordinator: TaylorGrillCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities(
+        TaylorProbeTarget(coordinator, entry.entry_id, f"External Probe {index}", index)
+        for index in (1, 2, 3)
+    )
+
+
+class TaylorProbeTarget(TaylorGrillEntity, RestoreNumber):
+    """Target temperature of a meat probe, used for its time-to-target estimate.
+
+    The controller has no per-probe target, so the value only lives in
+    Home Assistant and is restored after a restart.
+    """
+
+    _attr_device_class = NumberDeviceClass.TEMPERATURE
+    _attr_mode = NumberMode.BOX
+    _attr_icon = "mdi:thermometer-check"
+
+    def __init__(self, coordinator, entry_id, probe_name, probe_index):
+        """Initialize the number."""
+        super().__init__(coordinator)
+        self._attr_name = f"{probe_name} Target"
+        self._attr_unique_id = f"{entry_id}_probe_{probe_index}_target"
+        self._probe_index = probe_index
+        self._set_unit()
+        self._attr_native_value = None
+
+    def _set_unit(self):
+        """Take the temperature unit and matching range from the options."""
+        self._is_celsius = self._options_celsius
+        if self._is_celsius:
+            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+            self._attr_native_min_value = 38
+            self._attr_native_max_value = 149
+            self._attr_native_step = 0.5
+        else:
+            self._attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT
+            self._attr_native_min_value = 100
+            self._attr_native_max_value = 300
+            self._attr_native_step = 1
+
+    @property
+    def available(self):
+        """Stay settable while the grill is off, e.g. to prepare a cook."""
+        return True
+
+    async def async_added_to_hass(self):
+        """Restore the last target."""
+        await super().async_added_to_hass()
+        if (last := await self.async_get_last_number_data()) is None:
+            return
+        if (value := last.native_value) is None:
+            return
+        if last.native_unit_of_measurement != self._attr_native_unit_of_measurement:
+            # Saved before a unit change
+            if self._is_celsius:
+                value = round((value - 32) / 1.8 * 2) / 2
+            else:
+                value = round(value * 1.8 + 32)
+        self._set_target(value)
+
+    @callback
+    def _handle_options_update(self):
+        """Show the same target in the new unit if the unit changed."""
+        if self._is_celsius == self._options_celsius:
+            return
+        self._set_unit()
+        target_f = self.coordinator.probe_targets.get(self._probe_index)
+        if target_f is None:
+            self._attr_native_value = None
+        elif self._is_celsius:
+            self._attr_native_value = round((target_f - 32) / 1.8 * 2) / 2
+        else:
+            self._attr_native_value = round(target_f)
+        self.async_write_ha_state()
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Set a new target; the estimate follows with the next probe reading."""
+        self._set_target(value)
+        self.async_write_ha_state()
+
+    def _set_target(self, value: float) -> None:
+        """Store the target here and, in Fahrenheit, on the coordinator."""
+        self._attr_native_value = value
+        target_f = value * 1.8 + 32 if self._is_celsius else value
+        self.coordinator.probe_targets[self._probe_index] = target_f
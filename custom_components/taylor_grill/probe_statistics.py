@@ -0,0 +1,57 @@
+"""Long-term statistics of full-rate probe readings for Taylor Grill.
+
+In downsampled mode the probe sensors are written to the recorder only
+now and then, so the coordinator summarizes every reading per hour and
+imports the result as external statistics. They show up in the
+statistics graph card as taylor_grill:<device>_probe_<n>, always in
+Fahrenheit; Home Assistant converts them for display.
+"""
+from __future__ import annotations
+
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, PROBE_NAMES
+from .history import Bucket
+
+
+def statistic_id(device_id: str, probe_index: int) -> str:
+    """Return the external statistic id of a probe."""
+    return f"{DOMAIN}:{slugify(device_id)}_probe_{probe_index}"
+
+
+@callback
+def async_import_hour(
+    hass: HomeAssistant, device_id: str, device_name: str, probe_index: int, hour: Bucket
+) -> None:
+    """Import one finished hour of a probe, if the recorder is running."""
+    if "recorder" not in hass.config.components:
+        return
+    # Only imported with the recorder loaded; it is not a dependency
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    start, mean, minimum, maximum = hour
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name=f"{device_name} {PROBE_NAMES[probe_index]}",
+        source=DOMAIN,
+        statistic_id=statistic_id(device_id, probe_index),
+        unit_of_measurement=UnitOfTemperature.FAHRENHEIT,
+    )
+    async_add_external_statistics(
+        hass,
+        metadata,
+        [
+            StatisticData(
+                start=dt_util.utc_from_timestamp(start),
+                mean=mean,
+                min=minimum,
+                max=maximum,
+            )
+        ],
+    )
@@ -0,0 +1,377 @@
+"""Multi-step cook programs for Taylor Grill.
+
+A program is a list of steps such as "225F until probe 1 reaches 165F,
+then 275F for 2 h, then off". Probe conditions are checked on every
+decoded probe frame, so a step ends within one frame of its condition;
+timed steps of every grill share one TimerWheel that ticks once a second
+while any timer is pending.
+
+Targets go through the smoker's climate entity, so programs use the same
+debounce, confirmation and optimistic state as the UI.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Any, Protocol
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_TIMERS,
+    DOMAIN,
+    EVENT_PROGRAM_FINISHED,
+    EVENT_PROGRAM_STEP,
+    PROBE_NAMES,
+)
+from .protocol import PACKET_TEMPS, TempsFrame
+
+if TYPE_CHECKING:
+    from .coordinator import TaylorGrillCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Resolution (s) of the timer wheel, and its number of slots; timers
+# further out than one turn wait in their slot for later turns
+TICK = 1.0
+WHEEL_SLOTS = 256
+
+
+@callback
+def async_get_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Return the shared timer wheel, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (wheel := domain_data.get(DATA_TIMERS)) is None:
+        wheel = domain_data[DATA_TIMERS] = TimerWheel(hass)
+    return wheel
+
+
+class TimerWheel:
+    """Hashed timer wheel shared by the programs of all grills.
+
+    Scheduling and cancelling are O(1) dict operations; one tick fires
+    the due timers of one slot. The wheel only ticks while it holds
+    timers, and catches up on missed ticks from the monotonic clock.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty wheel."""
+        self.hass = hass
+        self._slots: list[dict[object, tuple[int, CALLBACK_TYPE]]] = [
+            {} for _ in range(WHEEL_SLOTS)
+        ]
+        self._count = 0
+        # Last tick whose slot has been processed
+        self._tick = self._now()
+        self._cancel_tick: CALLBACK_TYPE | None = None
+        self._tick_job = HassJob(self._async_tick, cancel_on_shutdown=True)
+
+    @staticmethod
+    def _now() -> int:
+        """Return the current tick number."""
+        return int(time.monotonic() / TICK)
+
+    @callback
+    def async_schedule(self, delay: float, action: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call action after delay seconds (rounded up to a tick); return its canceller."""
+        if self._count == 0:
+            self._tick = self._now()
+        due = max(self._now(), self._tick) + max(1, math.ceil(delay / TICK))
+        slot = self._slots[due % WHEEL_SLOTS]
+        key = object()
+        slot[key] = (due, action)
+        self._count += 1
+        if self._cancel_tick is None:
+            self._schedule_tick()
+
+        @callback
+        def cancel() -> None:
+            if slot.pop(key, None) is not None:
+                self._count -= 1
+
+        return cancel
+
+    @callback
+    def _schedule_tick(self) -> None:
+        """Arm the next tick."""
+        self._cancel_tick = async_call_later(self.hass, TICK, self._tick_job)
+
+    @callback
+    def _async_tick(self, _now=None) -> None:
+        """Fire the timers of every slot passed since the last tick."""
+        self._cancel_tick = None
+        now = self._now()
+        while self._tick < now and self._count:
+            self._tick += 1
+            tick = self._tick
+            slot = self._slots[tick % WHEEL_SLOTS]
+            due = [key for key, (at, _) in slot.items() if at <= tick]
+            for key in due:
+                _, action = slot.pop(key)
+                self._count -= 1
+                action()
+        self._tick = max(self._tick, now)
+        if self._count:
+            self._schedule_tick()
+
+
+class Thermostat(Protocol):
+    """The climate entity a program drives."""
+
+    hvac_mode: HVACMode | None
+
+    async def async_set_temperature(self, **kwargs: Any) -> None:
+        """Set a target in the display unit."""
+
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        """Turn the smoker on or off."""
+
+
+class ProgramStep:
+    """One step: a grill target (F) or off, and what ends it."""
+
+    __slots__ = ("target", "off", "probe", "probe_target", "duration")
+
+    def __init__(
+        self,
+        target: float | None = None,
+        off: bool = False,
+        probe: int | None = None,
+        probe_target: float | None = None,
+        duration: float | None = None,
+    ) -> None:
+        """Initialize the step; temperatures in Fahrenheit, duration in seconds."""
+        self.target = target
+        self.off = off
+        self.probe = probe
+        self.probe_target = probe_target
+        self.duration = duration
+
+    def describe(self) -> str:
+        """Return a short description for logs and attributes."""
+        if self.off:
+            return "off"
+        ends = []
+        if self.probe is not None:
+            ends.append(f"{PROBE_NAMES[self.probe]} reaches {self.probe_target:g}F")
+        if self.duration is not None:
+            ends.append(f"{timedelta(seconds=round(self.duration))} passed")
+        target = "hold" if self.target is None else f"{self.target:g}F"
+        return f"{target} until {' or '.join(ends)}"
+
+
+class ProgramRunner:
+    """Run one cook program on one grill."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: TaylorGrillCoordinator) -> None:
+        """Initialize an idle runner."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.steps: list[ProgramStep] = []
+        # Index of the running step, None while idle
+        self.step: int | None = None
+        self._thermostat: Thermostat | None = None
+        self._step_started: datetime | None = None
+        self._cancel_timer: CALLBACK_TYPE | None = None
+        self._cancel_listener: CALLBACK_TYPE | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def running(self) -> bool:
+        """Return True while a program runs."""
+        return self.step is not None
+
+    @callback
+    def async_set_thermostat(self, thermostat: Thermostat) -> CALLBACK_TYPE:
+        """Drive targets through this entity; return its remover."""
+        self._thermostat = thermostat
+
+        @callback
+        def remove() -> None:
+            if self._thermostat is thermostat:
+                self._thermostat = None
+                self.async_stop()
+
+        return remove
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Register a callback for when the program starts, steps or stops."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_start(self, steps: list[ProgramStep]) -> None:
+        """Stop any running program and start this one."""
+        if self._thermostat is None:
+            raise HomeAssistantError(f"{self.coordinator.device_name} has no smoker entity")
+        self.async_stop()
+        self.steps = steps
+        await self._async_enter(steps, 0)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the program, leaving the grill as it is."""
+        if self.step is None:
+            return
+        _LOGGER.info("%s: program stopped in step %s", self.coordinator.device_name, self.step + 1)
+        self._finish(completed=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the program state for attributes and diagnostics."""
+        if self.step is None:
+            return {"running": False}
+        return {
+            "running": True,
+            "step": self.step + 1,
+            "steps": [step.describe() for step in self.steps],
+            "step_started": self._step_started.isoformat(),
+        }
+
+    async def _async_enter(self, steps: list[ProgramStep], index: int) -> None:
+        """Apply a step of this program, if it still runs, and arm what ends it."""
+        if self.steps is not steps:
+            return
+        self._disarm()
+        if index >= len(steps):
+            _LOGGER.info("%s: program finished", self.coordinator.device_name)
+            self._finish(completed=True)
+            return
+        step = steps[index]
+        self.step = index
+        self._step_started = dt_util.utcnow()
+        _LOGGER.info("%s: program step %s: %s", self.coordinator.device_name, index + 1, step.describe())
+        self._fire(EVENT_PROGRAM_STEP, step=index + 1, description=step.describe())
+        self._notify()
+
+        try:
+            await self._async_apply(step)
+        except HomeAssistantError:
+            if self.steps is steps:
+                self._finish(completed=False)
+            raise
+        except Exception:  # pylint: disable=broad-except
+            # Raised in a task from _advance, this would otherwise vanish
+            # and leave the program "running" with nothing armed
+            _LOGGER.exception(
+                "%s: program step %s failed", self.coordinator.device_name, index + 1
+            )
+            if self.steps is steps:
+                self._finish(completed=False)
+            return
+        if self.steps is not steps or self.step != index:
+            # Stopped or restarted while commands were sent
+            return
+        if step.off:
+            await self._async_enter(steps, index + 1)
+            return
+        if step.probe is not None:
+            self._cancel_listener = self.coordinator.async_add_listener(
+                PACKET_TEMPS, self._handle_temps
+            )
+        if step.duration is not None:
+            self._cancel_timer = async_get_timer_wheel(self.hass).async_schedule(
+                step.duration, self._advance
+            )
+
+    async def _async_apply(self, step: ProgramStep) -> None:
+        """Set the grill up for a step through the smoker entity."""
+        thermostat = self._thermostat
+        if step.off:
+            await thermostat.async_set_hvac_mode(HVACMode.OFF)
+            return
+        if thermostat.hvac_mode != HVACMode.HEAT:
+            await thermostat.async_set_hvac_mode(HVACMode.HEAT)
+        if step.target is not None:
+            target = step.target
+            if self.coordinator.temp_unit == UnitOfTemperature.CELSIUS:
+                target = (target - 32) / 1.8
+            await thermostat.async_set_temperature(**{ATTR_TEMPERATURE: round(target)})
+
+    @callback
+    def _handle_temps(self, frame: TempsFrame) -> None:
+        """End the step once its probe reaches the probe target."""
+        step = self.steps[self.step]
+        value = frame.probes[step.probe]
+        if value is not None and value >= step.probe_target:
+            self._advance()
+
+    @callback
+    def _advance(self) -> None:
+        """Move on to the next step."""
+        if self.step is None:
+            return
+        index = self.step + 1
+        self._disarm()
+        self.hass.async_create_task(self._async_enter(self.steps, index))
+
+    @callback
+    def _disarm(self) -> None:
+        """Cancel the end conditions of the current step."""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+            self._cancel_timer = None
+        if self._cancel_listener is not None:
+            self._cancel_listener()
+            self._cancel_listener = None
+
+    @callback
+    def _finish(self, completed: bool) -> None:
+        """Go idle and announce how the program ended."""
+        self._disarm()
+        self.step = None
+        self.steps = []
+        self._fire(EVENT_PROGRAM_FINISHED, completed=completed)
+        self._notify()
+
+    @callback
+    def _fire(self, event: str, **data: Any) -> None:
+        """Fire a program event for this grill."""
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.coordinator.device_id)}
+        )
+        self.hass.bus.async_fire(
+            event, {"device_id": device.id if device else None, **data}
+        )
+
+    @callback
+    def _notify(self) -> None:
+        """Call the program listeners."""
+        for update_callback in tuple(self._listeners):
+            update_callback()
+
+
+def build_steps(raw_steps: list[dict[str, Any]], celsius: bool) -> list[ProgramStep]:
+    """Turn validated service data into steps, converting to Fahrenheit."""
+
+    def to_f(value: float | None) -> float | None:
+        if value is None or not celsius:
+            return value
+        return value * 1.8 + 32
+
+    steps = []
+    for raw in raw_steps:
+        duration = raw.get("duration")
+        steps.append(
+            ProgramStep(
+                target=to_f(raw.get("target")),
+                off=raw.get("off", False),
+                probe=raw.get("probe"),
+                probe_target=to_f(raw.get("temperature")),
+                duration=None if duration is None else duration.total_seconds(),
+            )
+        )
+    return steps
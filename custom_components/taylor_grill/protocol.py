@@ -0,0 +1,359 @@
+"""FA-framed binary protocol spoken by Taylor Grill controllers.
+
+Every frame looks like ``FA <len> FE <opcode> ... FF`` where ``len`` is the
+total frame length. Temperatures are sent as three decimal digits
+(hundreds, tens, units) in consecutive bytes.
+
+This module has no Home Assistant dependency so it can be reused by tools.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+
+FRAME_START = 0xFA
+FRAME_MARKER = 0xFE
+FRAME_END = 0xFF
+MIN_FRAME_LEN = 6
+
+# Opcodes (byte 3 of a frame)
+OPCODE_POWER = 0x01
+OPCODE_SET_TARGET = 0x05
+PACKET_STATUS = 0x0B
+PACKET_TARGET = 0x0D
+PACKET_TEMPS = 0x0E
+OPCODE_HANDSHAKE = 0x5F
+
+# --- COMMANDS ---
+CMD_ON = bytes.fromhex("fa06fe0101ff")
+CMD_OFF = bytes.fromhex("fa06fe0102ff")
+CMD_POLL_STATUS = bytes.fromhex("fa06fe0b01ff")
+CMD_POLL_TEMPS = bytes.fromhex("fa06fe0e01ff")
+CMD_POLL_TARGET = bytes.fromhex("fa06fe0d01ff")
+CMD_HANDSHAKE = bytes.fromhex("fa06fe5f01ff")
+
+# Status byte values. 0x01 (Startup) and 0x06 (Running) are ON.
+STATE_STARTUP = 0x01
+STATE_OFF = 0x02
+STATE_RUNNING = 0x06
+
+# Error flag offsets are relative to the 0xFE marker (index 2)
+ERROR_FLAG_OFFSETS = range(4, 12)
+
+# Probe digit positions: Internal(22), P1(4), P2(7), P3(10)
+PROBE_OFFSETS = (22, 4, 7, 10)
+TARGET_OFFSET = 22
+
+# Frame lengths produced by the encoders below
+STATUS_FRAME_LEN = 15
+DATA_FRAME_LEN = 26
+# Digits a controller sends for an unplugged probe
+UNPLUGGED = (9, 6, 0)
+
+
+class StatusFrame:
+    """Decoded 0x0B status frame."""
+
+    __slots__ = ("state", "flags")
+
+    opcode = PACKET_STATUS
+
+    def __init__(self, state: int, flags: int) -> None:
+        """Initialize the frame."""
+        self.state = state
+        self.flags = flags
+
+    @property
+    def is_on(self) -> bool:
+        """Return True unless the controller reports it is shut down."""
+        return self.state != STATE_OFF
+
+    def flag(self, offset: int) -> bool:
+        """Return the error flag at the given marker-relative offset."""
+        return bool(self.flags >> offset & 1)
+
+
+class TempsFrame:
+    """Decoded 0x0E probe frame, temperatures in Fahrenheit."""
+
+    __slots__ = ("probes",)
+
+    opcode = PACKET_TEMPS
+
+    def __init__(self, probes: tuple[int | None, ...]) -> None:
+        """Initialize the frame; probes are (internal, P1, P2, P3)."""
+        self.probes = probes
+
+    @property
+    def internal(self) -> int | None:
+        """Return the internal probe temperature."""
+        return self.probes[0]
+
+
+class TargetFrame:
+    """Decoded 0x0D target frame, temperature in Fahrenheit."""
+
+    __slots__ = ("target",)
+
+    opcode = PACKET_TARGET
+
+    def __init__(self, target: int) -> None:
+        """Initialize the frame."""
+        self.target = target
+
+
+Frame = StatusFrame | TempsFrame | TargetFrame
+
+
+def _bcd3(view: memoryview, offset: int) -> int | None:
+    """Return the three-digit value at offset, or None if a digit is invalid."""
+    hundreds = view[offset]
+    tens = view[offset + 1]
+    units = view[offset + 2]
+    if hundreds > 9 or tens > 9 or units > 9:
+        return None
+    return (hundreds * 100) + (tens * 10) + units
+
+
+def _decode_status(view: memoryview) -> StatusFrame:
+    """Decode a status frame."""
+    flags = 0
+    last = len(view) - 1
+    for offset in ERROR_FLAG_OFFSETS:
+        idx = 2 + offset
+        if idx >= last:
+            break
+        if view[idx] == 1:
+            flags |= 1 << offset
+    return StatusFrame(view[5], flags)
+
+
+def _decode_temps(view: memoryview) -> TempsFrame:
+    """Decode a probe frame. A hundreds digit above 5 means unplugged."""
+    probes = tuple(
+        None if view[offset] > 5 else _bcd3(view, offset) for offset in PROBE_OFFSETS
+    )
+    return TempsFrame(probes)
+
+
+def _decode_target(view: memoryview) -> TargetFrame | None:
+    """Decode a target frame."""
+    target = _bcd3(view, TARGET_OFFSET)
+    if not target:
+        return None
+    return TargetFrame(target)
+
+
+# opcode -> (minimum frame length, decoder)
+_DECODERS: dict[int, tuple[int, Callable[[memoryview], Frame | None]]] = {
+    PACKET_STATUS: (MIN_FRAME_LEN + 1, _decode_status),
+    PACKET_TEMPS: (TARGET_OFFSET + 4, _decode_temps),
+    PACKET_TARGET: (TARGET_OFFSET + 4, _decode_target),
+}
+# Opcodes decode_frame turns into frames; others carry no state
+DECODED_OPCODES = frozenset(_DECODERS)
+
+
+def decode_frame(data: bytes | bytearray | memoryview) -> Frame | None:
+    """Validate the FA framing of one frame and decode it.
+
+    Returns None for malformed frames and for opcodes that carry no state.
+    """
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    size = len(view)
+    if size < MIN_FRAME_LEN or view[0] != FRAME_START or view[2] != FRAME_MARKER:
+        return None
+
+    length = view[1]
+    if length < MIN_FRAME_LEN or length > size or view[length - 1] != FRAME_END:
+        return None
+
+    decoder = _DECODERS.get(view[3])
+    if decoder is None:
+        return None
+    min_len, decode = decoder
+    if length < min_len:
+        return None
+    return decode(view[:length])
+
+
+def _is_whole_frame(data: bytes) -> bool:
+    """Return True if data holds exactly one frame."""
+    size = len(data)
+    return (
+        size >= MIN_FRAME_LEN
+        and data[0] == FRAME_START
+        and data[1] == size
+        and data[-1] == FRAME_END
+    )
+
+
+def _holds_frame(data: bytes, start: int, size: int) -> bool:
+    """Return True if a complete frame starts at an FA at or after start."""
+    pos = data.find(FRAME_START, start)
+    while 0 <= pos < size - 2:
+        length = data[pos + 1]
+        end = pos + length
+        if (
+            length >= MIN_FRAME_LEN
+            and end <= size
+            and data[pos + 2] == FRAME_MARKER
+            and data[end - 1] == FRAME_END
+        ):
+            return True
+        pos = data.find(FRAME_START, pos + 1)
+    return False
+
+
+class FrameSplitter:
+    """Cut complete FA frames out of a stream of MQTT payloads.
+
+    A payload may hold several frames back to back, or only part of one.
+    The length byte is used to find frame boundaries; a trailing partial
+    frame (always shorter than 255 bytes) is kept until the next payload.
+    Garbage between frames is skipped by resyncing on the next 0xFA.
+    Frames not yet yielded when the consumer stops early are kept too.
+
+    Dropped data is counted: malformed is the number of skipped runs of
+    garbage and abandoned partials, discarded the bytes they held.
+    """
+
+    __slots__ = ("_buffer", "malformed", "discarded")
+
+    def __init__(self) -> None:
+        """Initialize the splitter."""
+        self._buffer = bytearray()
+        self.malformed = 0
+        self.discarded = 0
+
+    def reset(self) -> None:
+        """Drop any buffered partial frame."""
+        self._buffer.clear()
+
+    def feed(self, data: bytes) -> Iterator[memoryview]:
+        """Yield every complete frame available after appending data."""
+        if buffer := self._buffer:
+            # A payload that is exactly one frame means the buffered
+            # partial was abandoned by the controller. What a consumer
+            # left unread by stopping early is no partial; keep it.
+            if _is_whole_frame(data) and (len(buffer) < 2 or buffer[1] > len(buffer)):
+                self.malformed += 1
+                self.discarded += len(buffer)
+                buffer.clear()
+            else:
+                buffer += data
+                data = bytes(buffer)
+                buffer.clear()
+
+        view = memoryview(data)
+        size = len(data)
+        pos = 0
+        # Start of the garbage being skipped, -1 while in sync
+        junk = -1
+        try:
+            while pos < size:
+                if view[pos] != FRAME_START:
+                    if junk < 0:
+                        junk = pos
+                    pos = data.find(FRAME_START, pos + 1)
+                    if pos == -1:
+                        pos = size
+                        return
+                    continue
+                if pos + 1 >= size:
+                    break
+                length = view[pos + 1]
+                end = pos + length
+                if length < MIN_FRAME_LEN:
+                    if junk < 0:
+                        junk = pos
+                    pos += 1
+                    continue
+                if end > size:
+                    if not _holds_frame(data, pos + 1, size):
+                        break
+                    # A stray FA whose next byte reads as a long length;
+                    # the whole frame after it must not wait behind it
+                    if junk < 0:
+                        junk = pos
+                    pos += 1
+                    continue
+                if view[end - 1] != FRAME_END:
+                    if junk < 0:
+                        junk = pos
+                    pos += 1
+                    continue
+                if junk >= 0:
+                    self.malformed += 1
+                    self.discarded += pos - junk
+                    junk = -1
+                frame = view[pos:end]
+                # Past the frame before handing it out, so a consumer that
+                # stops here keeps the rest but never sees this one again
+                pos = end
+                yield frame
+        finally:
+            # Also runs when the consumer stops early, e.g. on an exception
+            if junk >= 0:
+                self.malformed += 1
+                self.discarded += pos - junk
+            if pos < size:
+                self._buffer += view[pos:]
+
+
+def encode_set_target(target_f: int) -> bytes:
+    """Build a set-target command for a Fahrenheit temperature."""
+    range_byte = target_f // 100
+    offset_byte = (target_f % 100) // 10
+    units_byte = target_f % 10
+
+    if range_byte > 5: range_byte = 5
+    if range_byte < 1: range_byte = 1
+
+    return bytes(
+        [FRAME_START, 0x09, FRAME_MARKER, OPCODE_SET_TARGET, 0x01,
+         range_byte, offset_byte, units_byte, FRAME_END]
+    )
+
+
+def _frame(opcode: int, length: int) -> bytearray:
+    """Return an empty frame with framing bytes filled in."""
+    frame = bytearray(length)
+    frame[0] = FRAME_START
+    frame[1] = length
+    frame[2] = FRAME_MARKER
+    frame[3] = opcode
+    frame[-1] = FRAME_END
+    return frame
+
+
+def _put_bcd3(frame: bytearray, offset: int, value: int | None) -> None:
+    """Write a three-digit value, or the unplugged marker for None."""
+    if value is None:
+        frame[offset : offset + 3] = bytes(UNPLUGGED)
+    else:
+        frame[offset : offset + 3] = bytes((value // 100, value // 10 % 10, value % 10))
+
+
+def encode_status(state: int, flags: int = 0) -> bytes:
+    """Build a 0x0B status frame as sent by a controller."""
+    frame = _frame(PACKET_STATUS, STATUS_FRAME_LEN)
+    frame[5] = state
+    for offset in ERROR_FLAG_OFFSETS:
+        if flags >> offset & 1:
+            frame[2 + offset] = 1
+    return bytes(frame)
+
+
+def encode_temps(probes: tuple[int | None, ...]) -> bytes:
+    """Build a 0x0E probe frame from (internal, P1, P2, P3) in Fahrenheit."""
+    frame = _frame(PACKET_TEMPS, DATA_FRAME_LEN)
+    for offset, value in zip(PROBE_OFFSETS, probes):
+        _put_bcd3(frame, offset, value)
+    return bytes(frame)
+
+
+def encode_target(target_f: int) -> bytes:
+    """Build a 0x0D target frame as sent by a controller."""
+    frame = _frame(PACKET_TARGET, DATA_FRAME_LEN)
+    _put_bcd3(frame, TARGET_OFFSET, target_f)
+    return bytes(frame)
@@ -0,0 +1,88 @@
+"""Shared dev2app subscription for all Taylor Grill devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+from homeassistant.components import mqtt
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_ROUTER, DOMAIN
+
+TOPIC_STATE_SUFFIX = "/dev2app"
+TOPIC_STATE_WILDCARD = f"+{TOPIC_STATE_SUFFIX}"
+_SUFFIX_LEN = len(TOPIC_STATE_SUFFIX)
+
+MessageCallback = Callable[[mqtt.ReceiveMessage], None]
+
+
+@callback
+def async_get_router(hass: HomeAssistant) -> TaylorGrillRouter:
+    """Return the router, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (router := domain_data.get(DATA_ROUTER)) is None:
+        router = domain_data[DATA_ROUTER] = TaylorGrillRouter(hass)
+    return router
+
+
+class TaylorGrillRouter:
+    """Subscribe once to +/dev2app and route messages by device id.
+
+    Adding a device costs one dict entry instead of another broker
+    subscription; messages from unknown devices are dropped after a
+    single dict lookup. The subscription is held while at least one
+    device is registered.
+
+    MQTT's + matches exactly one topic level, so a device id with a / in
+    it can never arrive through the wildcard; such a device gets its own
+    {device_id}/dev2app subscription instead.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the router."""
+        self.hass = hass
+        self._devices: dict[str, MessageCallback] = {}
+        self._unsubscribe: CALLBACK_TYPE | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_register(
+        self, device_id: str, message_callback: MessageCallback
+    ) -> CALLBACK_TYPE:
+        """Route a device's dev2app messages to a callback and return its remover."""
+        if "/" in device_id:
+            return await mqtt.async_subscribe(
+                self.hass, f"{device_id}{TOPIC_STATE_SUFFIX}", message_callback, encoding=None
+            )
+        self._devices[device_id] = message_callback
+        try:
+            async with self._lock:
+                if self._unsubscribe is None and self._devices:
+                    self._unsubscribe = await mqtt.async_subscribe(
+                        self.hass, TOPIC_STATE_WILDCARD, self._message_received, encoding=None
+                    )
+                    if not self._devices:
+                        # Everything unregistered while we were subscribing
+                        self._unsubscribe()
+                        self._unsubscribe = None
+        except BaseException:
+            # Cancelled or failed: the caller never gets a remover
+            if self._devices.get(device_id) is message_callback:
+                del self._devices[device_id]
+            raise
+
+        @callback
+        def unregister() -> None:
+            if self._devices.get(device_id) is message_callback:
+                del self._devices[device_id]
+            if not self._devices and self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+
+        return unregister
+
+    @callback
+    def _message_received(self, message: mqtt.ReceiveMessage) -> None:
+        """Hand a message to the device it belongs to."""
+        message_callback = self._devices.get(message.topic[:-_SUFFIX_LEN])
+        if message_callback is not None:
+            message_callback(message)
@@ -0,0 +1,204 @@
+"""State-aware poll scheduling for Taylor Grill controllers."""
+from __future__ import annotations
+
+from typing import Any
+
+from .protocol import (
+    CMD_POLL_STATUS,
+    CMD_POLL_TARGET,
+    CMD_POLL_TEMPS,
+    PACKET_STATUS,
+    PACKET_TARGET,
+    PACKET_TEMPS,
+    STATE_STARTUP,
+    Frame,
+)
+
+# Poll intervals in seconds. Fast matches the Android App heartbeat.
+POLL_FAST = 2
+POLL_STABLE = 6
+POLL_IDLE = 30
+# While the grill is offline the interval doubles from POLL_OFFLINE_MIN
+# up to POLL_OFFLINE_MAX, and only a status poll is sent
+POLL_OFFLINE_MIN = 4
+POLL_OFFLINE_MAX = 300
+# The first poll waits a random time up to this long, so grills set up
+# together after a restart do not all handshake at the same moment
+STARTUP_JITTER = 3.0
+
+# Internal probe change (F) between two samples that counts as "moving"
+TEMP_CHANGE_THRESHOLD = 2
+# Distance (F) from the setpoint that still counts as "at setpoint"
+SETPOINT_BAND = 15
+# How long (s) to stay fast after a user command
+FAST_HOLD = 30
+# The target only changes on user action, so it tolerates older data
+TARGET_MAX_AGE = 10
+
+# A frame that answers no poll is a push. Once an opcode has been pushed
+# PUSH_MIN_COUNT times in a row without a gap over PUSH_MAX_GAP seconds,
+# it is only polled when its data is older than PUSH_STALE_FACTOR times
+# the learned push interval.
+PUSH_MIN_COUNT = 3
+PUSH_MAX_GAP = 300
+PUSH_STALE_FACTOR = 2.5
+# Weight of the newest gap in the learned push interval
+PUSH_INTERVAL_WEIGHT = 0.2
+
+_POLL_COMMANDS = (
+    (PACKET_STATUS, CMD_POLL_STATUS),
+    (PACKET_TEMPS, CMD_POLL_TEMPS),
+    (PACKET_TARGET, CMD_POLL_TARGET),
+)
+
+
+class PollScheduler:
+    """Pick the poll rate from device state and skip polls for fresh data.
+
+    - fast while starting up, while the temperature is moving and shortly
+      after a user command
+    - slower once the pit holds its setpoint
+    - a slow keep-alive while the smoker is off
+    - an exponentially slower probe while the grill does not answer at all
+    - no poll for data the controller pushes by itself, until it is late
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._last_seen: dict[int, float] = {}
+        self._is_on: bool | None = None
+        self._starting = False
+        self._internal: int | None = None
+        self._target: int | None = None
+        self._moving = True
+        self._fast_until = 0.0
+        # Current offline interval; 0 while the grill answers
+        self._backoff = 0.0
+        # Per opcode: time of the last push, pushes in a row, learned interval
+        self._push_last: dict[int, float] = {}
+        self._push_count: dict[int, int] = {}
+        self._push_interval: dict[int, float] = {}
+
+    def observe(self, frame: Frame, now: float, solicited: bool = True) -> None:
+        """Record a decoded frame; solicited is False if it answered no poll."""
+        opcode = frame.opcode
+        self._last_seen[opcode] = now
+        self._backoff = 0.0
+        if not solicited:
+            self._observe_push(opcode, now)
+        elif opcode in self._push_last:
+            # An answer breaks the run of pushes in a row; learn afresh
+            del self._push_last[opcode]
+            self._push_count.pop(opcode, None)
+            self._push_interval.pop(opcode, None)
+        if opcode == PACKET_TEMPS:
+            internal = frame.probes[0]
+            if internal is not None and self._internal is not None:
+                self._moving = abs(internal - self._internal) >= TEMP_CHANGE_THRESHOLD
+            self._internal = internal
+        elif opcode == PACKET_STATUS:
+            self._is_on = frame.is_on
+            self._starting = frame.state == STATE_STARTUP
+        else:
+            self._target = frame.target
+
+    def _observe_push(self, opcode: int, now: float) -> None:
+        """Learn how often the controller pushes an opcode by itself."""
+        last = self._push_last.get(opcode)
+        self._push_last[opcode] = now
+        if last is None or now - last > PUSH_MAX_GAP:
+            self._push_count[opcode] = 1
+            self._push_interval.pop(opcode, None)
+            return
+        self._push_count[opcode] += 1
+        gap = now - last
+        interval = self._push_interval.get(opcode)
+        self._push_interval[opcode] = (
+            gap if interval is None else interval + PUSH_INTERVAL_WEIGHT * (gap - interval)
+        )
+
+    def _push_max_age(self, opcode: int, now: float) -> float | None:
+        """Return how old pushed data may get before polling, None if not pushed."""
+        if self._push_count.get(opcode, 0) < PUSH_MIN_COUNT:
+            return None
+        max_age = self._push_interval[opcode] * PUSH_STALE_FACTOR
+        if now - self._push_last[opcode] > max_age:
+            # The pushes stopped; poll until they resume
+            return None
+        return max_age
+
+    def mode(self, now: float) -> str:
+        """Return "polling", "mixed" or "passive" from the opcodes being pushed."""
+        pushed = sum(
+            self._push_max_age(opcode, now) is not None for opcode, _ in _POLL_COMMANDS
+        )
+        if not pushed:
+            return "polling"
+        return "passive" if pushed == len(_POLL_COMMANDS) else "mixed"
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the learned push behavior for diagnostics."""
+        return {
+            "mode": self.mode(now),
+            "interval": self.interval(now),
+            "pushes": {
+                f"0x{opcode:02X}": {
+                    "pushed": self._push_max_age(opcode, now) is not None,
+                    "count": self._push_count.get(opcode, 0),
+                    "interval": self._push_interval.get(opcode),
+                    "age": None if (last := self._push_last.get(opcode)) is None else now - last,
+                }
+                for opcode, _ in _POLL_COMMANDS
+            },
+        }
+
+    def hold_fast(self, now: float) -> None:
+        """Poll fast for a while, e.g. after a user command."""
+        self._fast_until = now + FAST_HOLD
+        self._last_seen.clear()
+
+    @property
+    def offline(self) -> bool:
+        """Return True while backing off from a silent grill."""
+        return self._backoff > 0
+
+    def back_off(self) -> None:
+        """Double the offline interval; the next decoded frame resets it."""
+        self._backoff = min(max(self._backoff * 2, POLL_OFFLINE_MIN), POLL_OFFLINE_MAX)
+
+    def interval(self, now: float) -> float:
+        """Return the delay until the next poll cycle."""
+        if self._backoff:
+            return self._backoff
+        if now < self._fast_until or self._is_on is None:
+            return POLL_FAST
+        if not self._is_on:
+            return POLL_IDLE
+        if self._starting or self._moving:
+            return POLL_FAST
+        if (
+            self._internal is None
+            or self._target is None
+            or abs(self._internal - self._target) > SETPOINT_BAND
+        ):
+            return POLL_FAST
+        return POLL_STABLE
+
+    def due(self, now: float) -> list[bytes]:
+        """Return the poll commands whose data is not fresh."""
+        if self._backoff:
+            return [CMD_POLL_STATUS]
+        interval = self.interval(now)
+        commands = []
+        for opcode, command in _POLL_COMMANDS:
+            seen = self._last_seen.get(opcode)
+            if seen is not None:
+                max_age = interval / 2
+                if opcode == PACKET_TARGET:
+                    max_age = max(max_age, TARGET_MAX_AGE)
+                if (push_max_age := self._push_max_age(opcode, now)) is not None:
+                    max_age = max(max_age, push_max_age)
+                if now - seen < max_age:
+                    continue
+            commands.append(command)
+        return commands
@@ -1,142 +1,458 @@
 """Sensor platform for Taylor Grill."""
+from datetime import timedelta
 import logging
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorEntity,
     SensorDeviceClass,
     SensorStateClass,
 )
 
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.const import UnitOfTemperature, CONF_NAME
-from homeassistant.components import mqtt
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature, UnitOfTime
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
-from .const import (
-    CONF_DEVICE_ID, 
-    CONF_TEMP_UNIT, 
-    DEFAULT_TEMP_UNIT, 
-    DOMAIN,
-    DEFAULT_NAME,
-    CONF_MANUFACTURER,
-    CONF_MODEL,
-    DEFAULT_MANUFACTURER,
-    DEFAULT_MODEL
-)
+from .const import DOMAIN, PROBE_NAMES
+from .coordinator import TaylorGrillCoordinator
+from .entity import TaylorGrillEntity
+from .history import TrendEstimator
+from .protocol import PACKET_STATUS, PACKET_TARGET, PACKET_TEMPS, Frame, TempsFrame
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rolling statistics from the coordinator's probe history
+PROBE_STATS_CONFIG = [
+    {
+        "name": "Rate of Rise",
+        "key": "rate",
+        "attribute": "rate",
+        "icon": "mdi:thermometer-chevron-up",
+        "enabled": True,
+    },
+    {
+        "name": "Minimum",
+        "key": "min",
+        "attribute": "minimum",
+        "icon": "mdi:thermometer-chevron-down",
+        "enabled": False,
+    },
+    {
+        "name": "Maximum",
+        "key": "max",
+        "attribute": "maximum",
+        "icon": "mdi:thermometer-high",
+        "enabled": False,
+    },
+    {
+        "name": "Average",
+        "key": "average",
+        "attribute": "average",
+        "icon": "mdi:thermometer",
+        "enabled": False,
+    },
+]
+
+# Link health sensors; they refresh on a timer instead of on every frame
+STATS_REFRESH_INTERVAL = timedelta(seconds=60)
+LINK_STATS_CONFIG = [
+    {
+        "name": "Frames Received",
+        "key": "frames",
+        "icon": "mdi:message-arrow-left-outline",
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "unit": None,
+        "value": lambda stats: stats.frames_total,
+        "enabled": True,
+    },
+    {
+        "name": "Malformed Frames",
+        # Keeps the unique id of the former Rejected Frames sensor
+        "key": "rejected",
+        "icon": "mdi:message-alert-outline",
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "unit": None,
+        "value": lambda stats: stats.malformed,
+        "enabled": True,
+    },
+    {
+        "name": "Poll Response Rate",
+        "key": "response_rate",
+        "icon": "mdi:wifi-check",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": PERCENTAGE,
+        "value": lambda stats: None if stats.response_rate is None else round(stats.response_rate, 1),
+        "enabled": True,
+    },
+    {
+        "name": "Poll Response Time",
+        "key": "response_time",
+        "icon": "mdi:timer-outline",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": UnitOfTime.MILLISECONDS,
+        "value": lambda stats: stats.response_ms.quantile(0.5),
+        "enabled": True,
+    },
+    {
+        "name": "Frame Parse Time",
+        "key": "parse_time",
+        "icon": "mdi:timer-cog-outline",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": UnitOfTime.MICROSECONDS,
+        "value": lambda stats: None if stats.parse_ns.mean is None else round(stats.parse_ns.mean / 1000, 2),
+        "enabled": False,
+    },
+]
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Taylor Grill sensors."""
-    device_name = entry.options.get(CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME))
-    device_id = entry.data[CONF_DEVICE_ID]
-    manufacturer = entry.options.get(CONF_MANUFACTURER, entry.data.get(CONF_MANUFACTURER, DEFAULT_MANUFACTURER))
-    model = entry.options.get(CONF_MODEL, entry.data.get(CONF_MODEL, DEFAULT_MODEL))
-    
-    temp_unit = entry.options.get(
-        CONF_TEMP_UNIT, entry.data.get(CONF_TEMP_UNIT, DEFAULT_TEMP_UNIT)
-    )
-    
-    sensors = [
-        TaylorSmokerSensor(hass, device_name, device_id, manufacturer, model, entry.entry_id, "Internal Probe", 0, temp_unit),
-        TaylorSmokerSensor(hass, device_name, device_id, manufacturer, model, entry.entry_id, "External Probe 1", 1, temp_unit),
-        TaylorSmokerSensor(hass, device_name, device_id, manufacturer, model, entry.entry_id, "External Probe 2", 2, temp_unit),
-        TaylorSmokerSensor(hass, device_name, device_id, manufacturer, model, entry.entry_id, "External Probe 3", 3, temp_unit),
-    ]
-    
+    coordinator: TaylorGrillCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    sensors = []
+    for index, name in enumerate(PROBE_NAMES):
+        sensors.append(TaylorSmokerSensor(coordinator, entry.entry_id, name, index))
+        for config in PROBE_STATS_CONFIG:
+            sensors.append(
+                TaylorProbeStatSensor(coordinator, entry.entry_id, name, index, config)
+            )
+        if index:
+            sensors.append(TaylorProbeEtaSensor(coordinator, entry.entry_id, name, index))
+    sensors.append(TaylorCommandLatencySensor(coordinator, entry.entry_id))
+    for config in LINK_STATS_CONFIG:
+        sensors.append(TaylorLinkStatSensor(coordinator, entry.entry_id, config))
+
     async_add_entities(sensors)
 
 
-class TaylorSmokerSensor(SensorEntity):
+class TaylorSmokerSensor(TaylorGrillEntity, RestoreSensor):
     """Representation of a Smoker Probe."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
+    # The buckets summarize readings the recorder already has in some form
+    _unrecorded_attributes = frozenset({"buckets"})
 
-    def __init__(self, hass, device_name, device_id, manufacturer, model, entry_id, probe_name, probe_index, temp_unit):
+    def __init__(self, coordinator, entry_id, probe_name, probe_index):
         """Initialize the sensor."""
-        self.hass = hass
+        super().__init__(coordinator)
         self._attr_name = probe_name
-        self._device_name = device_name
-        self._device_id = device_id
-        self._manufacturer = manufacturer
-        self._model = model
         self._attr_unique_id = f"{entry_id}_probe_{probe_index}"
         self._probe_index = probe_index
-        
-        self._is_celsius = temp_unit == UnitOfTemperature.CELSIUS
+        self._set_unit()
+        self._state = None
+
+    def _set_unit(self):
+        """Take the temperature unit from the options."""
+        self._is_celsius = self._options_celsius
         if self._is_celsius:
              self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
         else:
              self._attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT
-        
-        self._topic_state = f"{device_id}/dev2app"
-        self._state = None
 
     async def async_added_to_hass(self):
-        """Subscribe to MQTT topics."""
-        @callback
-        def message_received(message):
-            self._parse_status(message.payload)
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        if (last := await self.async_get_last_sensor_data()) is not None:
+            self._restore(last.native_value, last.native_unit_of_measurement)
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_TEMPS, self._handle_temps)
+        )
+
+    def _restore(self, value, unit):
+        """Show the last reading until the grill answers."""
+        if not isinstance(value, (int, float)):
+            return
+        if unit == self._attr_native_unit_of_measurement:
+            self._state = value
+        elif self._is_celsius:
+            # Saved before a unit change
+            self._state = self._to_state(value)
+        else:
+            self._state = round(value * 1.8 + 32)
+
+    @callback
+    def _handle_temps(self, frame: TempsFrame):
+        """Handle decoded probe temperatures."""
+        state = self._to_state(frame.probes[self._probe_index])
+        if self._temp_changed(self._state, state):
+            self._state = state
+            self.async_schedule_write()
+
+    @callback
+    def _handle_options_update(self):
+        """Convert the last reading if the unit changed."""
+        if self._is_celsius != self._options_celsius:
+            self._set_unit()
+            latest = self.coordinator.history[self._probe_index].latest
+            self._state = self._to_state(None if latest is None else int(latest))
+            self.async_schedule_write()
+
+    def _to_state(self, raw_f):
+        """Convert a Fahrenheit reading to the display unit."""
+        if raw_f is None:
+            return None
+        if self._is_celsius:
+            return round((raw_f - 32) / 1.8, 1)
+        return raw_f
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        """Return recent 5-minute mean/min/max of every reading in downsampled mode."""
+        if not self.coordinator.probe_interval:
+            return None
+        convert = self._to_bucket_value
+        return {
+            "buckets": [
+                {
+                    "start": dt_util.utc_from_timestamp(start).isoformat(),
+                    "mean": convert(mean),
+                    "min": convert(minimum),
+                    "max": convert(maximum),
+                }
+                for start, mean, minimum, maximum in self.coordinator.buckets[
+                    self._probe_index
+                ].buckets
+            ]
+        }
+
+    def _to_bucket_value(self, value_f):
+        """Convert a Fahrenheit bucket value to the display unit."""
+        if self._is_celsius:
+            return round((value_f - 32) / 1.8, 1)
+        return round(value_f, 1)
+
+
+class TaylorProbeStatSensor(TaylorGrillEntity, SensorEntity):
+    """Rolling rate of rise, minimum, maximum or average of one probe."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry_id, probe_name, probe_index, config):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = f"{probe_name} {config['name']}"
+        self._attr_unique_id = f"{entry_id}_probe_{probe_index}_{config['key']}"
+        self._attr_icon = config["icon"]
+        self._attr_entity_registry_enabled_default = config["enabled"]
+        self._history = coordinator.history[probe_index]
+        self._attribute = config["attribute"]
+        self._is_rate = config["key"] == "rate"
+        if not self._is_rate:
+            self._attr_device_class = SensorDeviceClass.TEMPERATURE
+        self._set_unit()
+        self._state = None
+
+    def _set_unit(self):
+        """Take the temperature unit from the options."""
+        self._is_celsius = self._options_celsius
+        unit = UnitOfTemperature.CELSIUS if self._is_celsius else UnitOfTemperature.FAHRENHEIT
+        self._attr_native_unit_of_measurement = f"{unit}/min" if self._is_rate else unit
 
-        await mqtt.async_subscribe(
-            self.hass, self._topic_state, message_received, encoding=None
+    async def async_added_to_hass(self):
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_TEMPS, self._handle_temps)
         )
 
+    @callback
+    def _handle_temps(self, frame: TempsFrame):
+        """Read the statistic after the coordinator added this frame to the history."""
+        state = self._read_state()
+        if self._is_rate:
+            changed = state != self._state
+        else:
+            changed = self._temp_changed(self._state, state)
+        if changed:
+            self._state = state
+            self.async_schedule_write()
+
+    @callback
+    def _handle_options_update(self):
+        """Re-read the statistic if the unit changed."""
+        if self._is_celsius != self._options_celsius:
+            self._set_unit()
+            self._state = self._read_state()
+            self.async_schedule_write()
+
+    def _read_state(self):
+        """Return the statistic in the display unit."""
+        value = getattr(self._history, self._attribute)
+        if value is None:
+            return None
+        if self._is_rate:
+            return round(value / 1.8 if self._is_celsius else value, 2)
+        if self._is_celsius:
+            return round((value - 32) / 1.8, 1)
+        return round(value, 1)
+
     @property
-    def device_info(self) -> DeviceInfo:
-        """Return information to link this entity with the device."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-            manufacturer=self._manufacturer,
-            model=self._model,
-    )
-
-    def _parse_status(self, payload):
-        """Parse the binary status message for specific probes."""
-        if self._probe_index == 0:
-            _LOGGER.debug(f"RAW MQTT PACKET: {payload.hex()}")
-
-        if len(payload) < 25 or payload[0] != 0xFA:
-            return
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self._state
 
-        if payload[3] != 0x0E:
-            return
 
-        try:
-            if self._probe_index == 0: start_byte = 22
-            elif self._probe_index == 1: start_byte = 4
-            elif self._probe_index == 2: start_byte = 7
-            elif self._probe_index == 3: start_byte = 10
-            else: return
-
-            hundreds = payload[start_byte]
-            tens = payload[start_byte + 1]
-            units = payload[start_byte + 2]
-
-            if hundreds > 5: 
-                self._state = None
-            elif hundreds <= 9 and tens <= 9 and units <= 9:
-                raw_f = (hundreds * 100) + (tens * 10) + units
-                
-                if self._is_celsius:
-                    self._state = round((raw_f - 32) / 1.8, 1)
-                else:
-                    self._state = raw_f
-            
-            self.async_write_ha_state()
-
-        except IndexError:
-            pass
+class TaylorProbeEtaSensor(TaylorGrillEntity, SensorEntity):
+    """Estimated minutes until a meat probe reaches its target."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, coordinator, entry_id, probe_name, probe_index):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = f"{probe_name} Time to Target"
+        self._attr_unique_id = f"{entry_id}_probe_{probe_index}_eta"
+        self._probe_index = probe_index
+        self._estimator = TrendEstimator()
+        self._state = None
+
+    async def async_added_to_hass(self):
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_TEMPS, self._handle_temps)
+        )
+
+    @callback
+    def _handle_temps(self, frame: TempsFrame):
+        """Update the trend with the new reading and re-estimate."""
+        raw_f = frame.probes[self._probe_index]
+        if raw_f is None:
+            self._estimator.reset()
+            state = None
+        else:
+            self._estimator.add(self.coordinator.frame_time, raw_f)
+            target = self.coordinator.probe_targets.get(self._probe_index)
+            eta = None if target is None else self._estimator.eta(target)
+            state = None if eta is None else round(eta / 60)
+
+        if state != self._state:
+            self._state = state
+            self.async_schedule_write()
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self._state
\ No newline at end of file
+        return self._state
+
+
+class TaylorCommandLatencySensor(TaylorGrillEntity, SensorEntity):
+    """Time from sending a command until the grill reported its effect."""
+
+    _attr_name = "Command Latency"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-check-outline"
+
+    def __init__(self, coordinator, entry_id):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry_id}_command_latency"
+        self._acks = coordinator.acks
+        self._state = None
+        self._counts = (0, 0, 0)
+
+    async def async_added_to_hass(self):
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        # Commands are confirmed by status and target frames
+        for packet_type in (PACKET_STATUS, PACKET_TARGET):
+            self.async_on_remove(
+                self.coordinator.async_add_listener(packet_type, self._handle_frame)
+            )
+
+    @callback
+    def _handle_frame(self, frame: Frame):
+        """Pick up a new measurement once the tracker has seen the frame."""
+        acks = self._acks
+        counts = (acks.confirmed, acks.retries, acks.failures)
+        if counts != self._counts:
+            self._counts = counts
+            if acks.latency is not None:
+                self._state = round(acks.latency * 1000)
+            self.async_schedule_write()
+
+    @property
+    def native_value(self):
+        """Return the latency of the last confirmed command."""
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        """Return how many commands were confirmed, resent and given up."""
+        confirmed, retries, failures = self._counts
+        return {"confirmed": confirmed, "retries": retries, "failures": failures}
+
+
+class TaylorLinkStatSensor(TaylorGrillEntity, SensorEntity):
+    """One link health figure from the coordinator's traffic counters."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, entry_id, config):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_name = config["name"]
+        self._attr_unique_id = f"{entry_id}_{config['key']}"
+        self._attr_icon = config["icon"]
+        self._attr_state_class = config["state_class"]
+        self._attr_native_unit_of_measurement = config["unit"]
+        self._attr_entity_registry_enabled_default = config["enabled"]
+        if config["unit"] in (UnitOfTime.MILLISECONDS, UnitOfTime.MICROSECONDS):
+            self._attr_device_class = SensorDeviceClass.DURATION
+        self._stats = coordinator.stats
+        self._value = config["value"]
+        self._key = config["key"]
+
+    @property
+    def available(self):
+        """Keep reporting while the grill is offline; that is when these matter."""
+        return True
+
+    async def async_added_to_hass(self):
+        """Refresh periodically; the counters change on every frame."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(self.hass, self._async_refresh, STATS_REFRESH_INTERVAL)
+        )
+
+    @callback
+    def _async_refresh(self, _now=None):
+        """Write the current figures."""
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        """Return the current figure."""
+        return self._value(self._stats)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the breakdown behind the figure."""
+        stats = self._stats
+        if self._key == "frames":
+            return stats.as_dict()["frames"]
+        if self._key == "rejected":
+            return {"discarded_bytes": stats.discarded, "bad_frames": stats.bad_frames}
+        if self._key == "response_rate":
+            return {"polls": stats.polls, "responses": stats.responses, "timeouts": stats.timeouts}
+        if self._key == "response_time":
+            return {"p95": stats.response_ms.quantile(0.95), "max": stats.response_ms.max}
+        if self._key == "parse_time":
+            return {"frames": stats.parse_ns.count, "max_us": round(stats.parse_ns.max / 1000, 2)}
+        return None
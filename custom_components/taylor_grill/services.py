@@ -0,0 +1,250 @@
+"""Services for Taylor Grill."""
+from __future__ import annotations
+
+from datetime import datetime
+import os
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID, UnitOfTemperature
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .capture import CAPTURE_SUFFIX, async_replay, read_capture
+from .const import DOMAIN
+from .cooklog import COOK_LOG_SUFFIX, CookLog, export_csv, export_json
+from .program import build_steps
+from .coordinator import TaylorGrillCoordinator
+from .trace import DIRECTION_RX
+
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+SERVICE_EXPORT_COOK_LOG = "export_cook_log"
+SERVICE_START_PROGRAM = "start_program"
+SERVICE_STOP_PROGRAM = "stop_program"
+
+ATTR_FILENAME = "filename"
+ATTR_SPEED = "speed"
+ATTR_FORMAT = "format"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_OUTPUT = "output"
+ATTR_STEPS = "steps"
+ATTR_TARGET = "target"
+ATTR_OFF = "off"
+ATTR_PROBE = "probe"
+ATTR_TEMPERATURE = "temperature"
+ATTR_DURATION = "duration"
+
+EXPORT_FORMATS = {"csv": export_csv, "json": export_json}
+
+# Capture files and cook logs live in <config>/taylor_grill/
+CAPTURE_DIR = DOMAIN
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+STOP_CAPTURE_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+REPLAY_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+EXPORT_COOK_LOG_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_FILENAME): cv.string,
+        vol.Optional(ATTR_FORMAT, default="csv"): vol.In(EXPORT_FORMATS),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_OUTPUT): cv.string,
+    }
+)
+
+
+
+def _validate_step(step: dict) -> dict:
+    """Check that a program step makes sense as a whole."""
+    if step.get(ATTR_OFF):
+        if len(step) > 1:
+            raise vol.Invalid("an off step takes no other keys")
+        return step
+    if (ATTR_PROBE in step) != (ATTR_TEMPERATURE in step):
+        raise vol.Invalid("probe and temperature go together")
+    if ATTR_PROBE not in step and ATTR_DURATION not in step:
+        raise vol.Invalid("a step needs a probe temperature or a duration to end")
+    return step
+
+
+PROGRAM_STEP_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_TARGET): vol.Coerce(float),
+            vol.Optional(ATTR_OFF): cv.boolean,
+            vol.Optional(ATTR_PROBE): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_DURATION): cv.positive_time_period,
+        }
+    ),
+    _validate_step,
+)
+START_PROGRAM_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_STEPS): vol.All(
+            cv.ensure_list, vol.Length(min=1), [PROGRAM_STEP_SCHEMA]
+        ),
+    }
+)
+STOP_PROGRAM_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_start_capture(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        filename = call.data.get(ATTR_FILENAME) or (
+            f"{coordinator.file_prefix}_{datetime.now():%Y%m%d_%H%M%S}{CAPTURE_SUFFIX}"
+        )
+        path = _file_path(hass, filename)
+        await hass.async_add_executor_job(
+            lambda: os.makedirs(os.path.dirname(path), exist_ok=True)
+        )
+        await coordinator.async_start_capture(path)
+
+    async def async_stop_capture(call: ServiceCall) -> None:
+        await _get_coordinator(hass, call).async_stop_capture()
+
+    async def async_replay_capture(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        path = _file_path(hass, call.data[ATTR_FILENAME])
+        try:
+            records = await hass.async_add_executor_job(
+                lambda: list(read_capture(path))
+            )
+        except (OSError, ValueError) as err:
+            raise ServiceValidationError(str(err)) from err
+
+        @callback
+        def feed(direction: int, data: bytes) -> None:
+            if direction == DIRECTION_RX:
+                coordinator.async_feed(data)
+
+        await async_replay(records, feed, call.data[ATTR_SPEED])
+
+    async def async_export_cook_log(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        await coordinator.async_flush_cook_log()
+        if filename := call.data.get(ATTR_FILENAME):
+            source = _file_path(hass, filename)
+        else:
+            source = await hass.async_add_executor_job(
+                _latest_cook_log, hass.config.path(CAPTURE_DIR), coordinator.file_prefix
+            )
+            if source is None:
+                raise ServiceValidationError(
+                    f"No cook log found for {coordinator.device_id}"
+                )
+        export_format = call.data[ATTR_FORMAT]
+        output = call.data.get(ATTR_OUTPUT) or (
+            f"{os.path.splitext(os.path.basename(source))[0]}.{export_format}"
+        )
+        target = _file_path(hass, output)
+        # Naive times are in Home Assistant's time zone, not the process's
+        start, end = (
+            None if (value := call.data.get(key)) is None else dt_util.as_utc(value).timestamp()
+            for key in (ATTR_START, ATTR_END)
+        )
+
+        def export() -> int:
+            with CookLog(source) as log, open(target, "w", encoding="utf-8") as file:
+                return EXPORT_FORMATS[export_format](log, file, start, end)
+
+        try:
+            records = await hass.async_add_executor_job(export)
+        except (OSError, ValueError) as err:
+            raise ServiceValidationError(str(err)) from err
+        return {"path": target, "records": records}
+
+    async def async_start_program(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        steps = build_steps(
+            call.data[ATTR_STEPS], coordinator.temp_unit == UnitOfTemperature.CELSIUS
+        )
+        await coordinator.program.async_start(steps)
+
+    async def async_stop_program(call: ServiceCall) -> None:
+        _get_coordinator(hass, call).program.async_stop()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_CAPTURE, async_start_capture, START_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_CAPTURE, async_stop_capture, STOP_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_REPLAY_CAPTURE, async_replay_capture, REPLAY_CAPTURE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_COOK_LOG,
+        async_export_cook_log,
+        EXPORT_COOK_LOG_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_PROGRAM, async_start_program, START_PROGRAM_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_PROGRAM, async_stop_program, STOP_PROGRAM_SCHEMA
+    )
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> TaylorGrillCoordinator:
+    """Return the coordinator of the device targeted by a service call."""
+    device = dr.async_get(hass).async_get(call.data[ATTR_DEVICE_ID])
+    if device is not None:
+        for entry_id in device.config_entries:
+            if (coordinator := hass.data.get(DOMAIN, {}).get(entry_id)) is not None:
+                return coordinator
+    raise ServiceValidationError(
+        f"{call.data[ATTR_DEVICE_ID]} is not a loaded Taylor Grill device"
+    )
+
+
+def _file_path(hass: HomeAssistant, filename: str) -> str:
+    """Return the path of a file in CAPTURE_DIR, refusing anything outside it."""
+    if os.path.basename(filename) != filename or filename in ("", ".", ".."):
+        raise ServiceValidationError(f"Invalid file name: {filename}")
+    return hass.config.path(CAPTURE_DIR, filename)
+
+
+def _latest_cook_log(directory: str, prefix: str) -> str | None:
+    """Return the newest cook log with a file prefix; names sort by start time."""
+    try:
+        names = [
+            name
+            for name in os.listdir(directory)
+            if name.startswith(f"{prefix}_") and name.endswith(COOK_LOG_SUFFIX)
+        ]
+    except FileNotFoundError:
+        return None
+    return os.path.join(directory, max(names)) if names else None
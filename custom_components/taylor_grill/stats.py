@@ -0,0 +1,157 @@
+"""Link health counters and histograms for Taylor Grill.
+
+Everything here is fixed-size: counters are plain ints and histograms
+use power-of-two buckets picked with int.bit_length(), so recording a
+value on the hot path is a few integer operations.
+
+This module has no Home Assistant dependency so it can be reused by tools.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from .protocol import (
+    DECODED_OPCODES,
+    FRAME_MARKER,
+    PACKET_STATUS,
+    PACKET_TARGET,
+    PACKET_TEMPS,
+    FrameSplitter,
+)
+
+_OPCODE_NAMES = {
+    PACKET_STATUS: "status_0x0B",
+    PACKET_TARGET: "target_0x0D",
+    PACKET_TEMPS: "temps_0x0E",
+}
+
+
+class Histogram:
+    """Count non-negative integers in power-of-two buckets.
+
+    Bucket i holds values below 2**i (and at least 2**(i - 1)); the last
+    bucket also takes everything larger.
+    """
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty histogram with size buckets."""
+        self.buckets = [0] * size
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value: int) -> None:
+        """Record one value."""
+        buckets = self.buckets
+        buckets[min(value.bit_length(), len(buckets) - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of all values."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> int | None:
+        """Return the upper bound of the bucket holding quantile q."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        last = len(self.buckets) - 1
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return self.max if i == last else min(1 << i, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly summary."""
+        last = len(self.buckets) - 1
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": {
+                f"<{1 << i}" if i < last else f">={1 << (i - 1)}": n
+                for i, n in enumerate(self.buckets)
+                if n
+            },
+        }
+
+
+class LinkStats:
+    """Traffic counters of one device since the integration started."""
+
+    __slots__ = (
+        "frames", "unknown", "bad_frames", "polls", "responses", "timeouts",
+        "parse_ns", "response_ms", "_splitter",
+    )
+
+    def __init__(self, splitter: FrameSplitter | None = None) -> None:
+        """Initialize all counters to zero; splitter adds what it dropped."""
+        self.frames = dict.fromkeys(_OPCODE_NAMES, 0)
+        # Well-framed frames with an opcode that carries no state, per opcode
+        self.unknown: dict[int, int] = {}
+        # Split frames decode_frame refused for their marker or content
+        self.bad_frames = 0
+        self._splitter = splitter
+        # Polls and commands that expect an answer, and how they ended
+        self.polls = 0
+        self.responses = 0
+        self.timeouts = 0
+        # Up to ~16 ms per decode and ~16 s per poll round trip
+        self.parse_ns = Histogram(25)
+        self.response_ms = Histogram(15)
+
+    def count_undecoded(self, raw: bytes | memoryview) -> None:
+        """Count a split frame decode_frame returned None for."""
+        opcode = raw[3]
+        if raw[2] == FRAME_MARKER and opcode not in DECODED_OPCODES:
+            self.unknown[opcode] = self.unknown.get(opcode, 0) + 1
+        else:
+            self.bad_frames += 1
+
+    @property
+    def frames_total(self) -> int:
+        """Return the number of well-framed frames, unknown opcodes included."""
+        return sum(self.frames.values()) + sum(self.unknown.values())
+
+    @property
+    def malformed(self) -> int:
+        """Return the garbage runs, abandoned partials and bad frames seen."""
+        splitter = self._splitter
+        return self.bad_frames + (splitter.malformed if splitter is not None else 0)
+
+    @property
+    def discarded(self) -> int:
+        """Return the bytes the splitter dropped."""
+        return self._splitter.discarded if self._splitter is not None else 0
+
+    @property
+    def response_rate(self) -> float | None:
+        """Return the percentage of answered polls."""
+        done = self.responses + self.timeouts
+        return self.responses / done * 100 if done else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly snapshot."""
+        return {
+            "frames": {
+                **{name: self.frames[opcode] for opcode, name in _OPCODE_NAMES.items()},
+                **{f"unknown_0x{opcode:02X}": count for opcode, count in sorted(self.unknown.items())},
+            },
+            "malformed": self.malformed,
+            "discarded_bytes": self.discarded,
+            "polls": self.polls,
+            "responses": self.responses,
+            "timeouts": self.timeouts,
+            "parse_ns": self.parse_ns.as_dict(),
+            "response_ms": self.response_ms.as_dict(),
+        }
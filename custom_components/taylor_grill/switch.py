@@ -1,100 +1,61 @@
 """Switch platform for Taylor Grill."""
 import logging
 
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.const import CONF_NAME
-from homeassistant.components import mqtt
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 
-from .const import (
-    CONF_DEVICE_ID, 
-    DOMAIN,
-    DEFAULT_NAME,
-    CONF_MANUFACTURER,
-    CONF_MODEL,
-    DEFAULT_MANUFACTURER,
-    DEFAULT_MODEL
-)
+from .commands import confirm_power
+from .const import DOMAIN
+from .coordinator import TaylorGrillCoordinator
+from .entity import TaylorGrillEntity
+from .protocol import CMD_OFF, CMD_ON, PACKET_STATUS, StatusFrame
 
 _LOGGER = logging.getLogger(__name__)
 
-# Binary Commands
-CMD_ON = bytes.fromhex("fa06fe0101ff")
-CMD_OFF = bytes.fromhex("fa06fe0102ff")
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the Taylor Grill switch."""
-    device_name = entry.options.get(CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME))
-    device_id = entry.data[CONF_DEVICE_ID]
-    manufacturer = entry.options.get(CONF_MANUFACTURER, entry.data.get(CONF_MANUFACTURER, DEFAULT_MANUFACTURER))
-    model = entry.options.get(CONF_MODEL, entry.data.get(CONF_MODEL, DEFAULT_MODEL))
-    
-    async_add_entities([TaylorSmokerSwitch(hass, device_name, device_id, manufacturer, model, entry.entry_id)])
+    coordinator: TaylorGrillCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities([TaylorSmokerSwitch(coordinator, entry.entry_id)])
 
 
-class TaylorSmokerSwitch(SwitchEntity):
+class TaylorSmokerSwitch(TaylorGrillEntity, SwitchEntity, RestoreEntity):
     """Representation of the Smoker Power Switch."""
 
-    _attr_has_entity_name = True
     _attr_name = "Power"
     
-    def __init__(self, hass, device_name, device_id, manufacturer,model, entry_id):
-        self.hass = hass
+    def __init__(self, coordinator, entry_id):
+        super().__init__(coordinator)
         self._attr_unique_id = f"{entry_id}_power_switch"
-        self._device_name = device_name
-        self._device_id = device_id
-        self._manufacturer = manufacturer
-        self._model = model
-        
-        self._topic_cmd = f"{device_id}/app2dev"
-        self._topic_state = f"{device_id}/dev2app"
         self._is_on = False
+        # State shown before an on/off command the grill has not reported on yet
+        self._is_on_before = None
 
     async def async_added_to_hass(self):
-        """Subscribe to MQTT topics."""
-        @callback
-        def message_received(message):
-            self._parse_status(message.payload)
-
-        await mqtt.async_subscribe(
-            self.hass, self._topic_state, message_received, encoding=None
+        """Register with the coordinator."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is not None:
+            # Shown until the first status frame arrives
+            self._is_on = last_state.state == STATE_ON
+        self.async_on_remove(
+            self.coordinator.async_add_listener(PACKET_STATUS, self._handle_status)
         )
 
-    def _parse_status(self, payload):
-        """Parse status for On/Off state."""
-        _LOGGER.debug(f"RAW MQTT PACKET (Switch): {payload.hex()}")
-        if len(payload) < 10 or payload[0] != 0xFA:
-            return
-
-        # Packet Type 0x0B contains the state
-        if payload[3] == 0x0B:
-            try:
-                state_byte = payload[5]
-                # 0x01 = Running, 0x06 = Startup, 0x02 = Shutdown
-                if state_byte in [0x01, 0x06]:
-                    self._is_on = True
-                elif state_byte == 0x02:
-                    self._is_on = False
-                self.async_write_ha_state()
-            except IndexError:
-                pass
-    
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return information to link this entity with the device."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
-            name=self._device_name,
-            manufacturer=self._manufacturer,
-            model=self._model,
-    )
+    @callback
+    def _handle_status(self, frame: StatusFrame):
+        """Handle a decoded status packet for On/Off state."""
+        self._is_on_before = None
+        if self._is_on != frame.is_on:
+            self._is_on = frame.is_on
+            self.async_schedule_write()
 
     @property
     def is_on(self):
@@ -103,14 +64,32 @@ class TaylorSmokerSwitch(SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
-        _LOGGER.debug(f"Turning smoker ON: {CMD_ON.hex()}")
-        await mqtt.async_publish(self.hass, self._topic_cmd, CMD_ON)
+        _LOGGER.debug("Turning smoker ON: %s", CMD_ON.hex())
+        await self.coordinator.async_send_command(CMD_ON, confirm_power(True), self._revert)
+        self._save_state()
         self._is_on = True
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
-        _LOGGER.debug(f"Turning smoker OFF: {CMD_OFF.hex()}")
-        await mqtt.async_publish(self.hass, self._topic_cmd, CMD_OFF)
+        _LOGGER.debug("Turning smoker OFF: %s", CMD_OFF.hex())
+        await self.coordinator.async_send_command(CMD_OFF, confirm_power(False), self._revert)
+        self._save_state()
         self._is_on = False
+        self.async_write_ha_state()
+
+    @callback
+    def _save_state(self):
+        """Remember the state to revert to; an unconfirmed earlier command keeps its own."""
+        if self._is_on_before is None:
+            self._is_on_before = self._is_on
+
+    @callback
+    def _revert(self):
+        """The grill ignored the command; show the state from before it again."""
+        if self._is_on_before is None:
+            # A status frame came in since; the state shown is the grill's own
+            return
+        self._is_on = self._is_on_before
+        self._is_on_before = None
         self.async_write_ha_state()
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""Packet trace ring buffer for Taylor Grill diagnostics."""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+import time
+from typing import Any
+
+DIRECTION_RX = 0
+DIRECTION_TX = 1
+
+_DIRECTION_NAMES = ("dev2app", "app2dev")
+
+# Number of raw frames and commands kept per device
+TRACE_SIZE = 200
+
+
+class PacketTrace:
+    """Keep the last TRACE_SIZE packets of a device.
+
+    The slots are preallocated and recording only stores references, so
+    nothing is formatted until a snapshot is requested.
+    """
+
+    __slots__ = ("_times", "_directions", "_data", "_size", "_next", "_count")
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        """Initialize the trace."""
+        self._size = size
+        self._times = [0.0] * size
+        self._directions = [0] * size
+        self._data: list[bytes] = [b""] * size
+        self._next = 0
+        self._count = 0
+
+    def record(self, direction: int, data: bytes) -> None:
+        """Store a packet, overwriting the oldest once full."""
+        i = self._next
+        self._times[i] = time.time()
+        self._directions[i] = direction
+        self._data[i] = data
+        self._next = (i + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+
+    def __len__(self) -> int:
+        """Return the number of packets held."""
+        return self._count
+
+    def __iter__(self):
+        """Yield (timestamp, direction, data) from oldest to newest."""
+        start = (self._next - self._count) % self._size
+        for n in range(self._count):
+            i = (start + n) % self._size
+            yield self._times[i], self._directions[i], self._data[i]
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Render the trace for a diagnostics download."""
+        return [
+            {
+                "time": datetime.fromtimestamp(ts, UTC).isoformat(),
+                "topic": _DIRECTION_NAMES[direction],
+                "data": bytes(data).hex(" "),
+            }
+            for ts, direction, data in self
+        ]
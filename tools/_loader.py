@@ -0,0 +1,23 @@
+"""Import the integration's standalone modules from a source checkout.
+
+protocol.py, capture.py and friends do not need Home Assistant. Loading
+them through a bare package object skips ``taylor_grill/__init__.py`` so
+the tools run on a machine without Home Assistant installed.
+"""
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+import sys
+import types
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "taylor_grill"
+
+
+def load(name: str) -> types.ModuleType:
+    """Return taylor_grill.<name>."""
+    if "taylor_grill" not in sys.modules:
+        package = types.ModuleType("taylor_grill")
+        package.__path__ = [str(PACKAGE_DIR)]
+        sys.modules["taylor_grill"] = package
+    return importlib.import_module(f"taylor_grill.{name}")
@@ -0,0 +1,231 @@
+"""Benchmark the Taylor Grill frame decode, dispatch and state-write paths.
+
+    python tools/benchmark.py                          # print results
+    python tools/benchmark.py --json before.json       # also save them
+    python tools/benchmark.py --compare before.json    # diff against a run
+
+Decode benchmarks only need the standard library. Dispatch benchmarks
+build real coordinators and entities for 1, 10 and 100 simulated grills
+and need the homeassistant package installed; hass and MQTT are replaced
+by a minimal stand-in and state writes are counted instead of performed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from _loader import PACKAGE_DIR, load
+
+protocol = load("protocol")
+
+GRILL_COUNTS = (1, 10, 100)
+
+
+def _git_commit() -> str | None:
+    """Return the current commit hash, if run from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PACKAGE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _frames() -> dict[str, bytes]:
+    """Return one representative frame per packet type."""
+    return {
+        "status_0x0B": protocol.encode_status(protocol.STATE_RUNNING, 1 << 11),
+        "target_0x0D": protocol.encode_target(225),
+        "temps_0x0E": protocol.encode_temps((226, 151, None, 98)),
+    }
+
+
+def _best_of(func, repeat: int = 5) -> float:
+    """Return the fastest of several timed runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_decode(iterations: int) -> dict[str, Any]:
+    """Measure decode_frame and FrameSplitter throughput per packet type."""
+    decode = protocol.decode_frame
+    results: dict[str, Any] = {}
+    for name, frame in _frames().items():
+        def run(frame=frame) -> None:
+            for _ in range(iterations):
+                decode(frame)
+        elapsed = _best_of(run)
+        results[name] = {"frames_per_s": iterations / elapsed, "ns_per_frame": elapsed / iterations * 1e9}
+
+    # A batched payload holding all three responses, split then decoded
+    batch = b"".join(_frames().values())
+    splitter = protocol.FrameSplitter()
+    def run_batch() -> None:
+        for _ in range(iterations // 3):
+            for raw in splitter.feed(batch):
+                decode(raw)
+    elapsed = _best_of(run_batch)
+    frames = iterations // 3 * 3
+    results["batched_split"] = {"frames_per_s": frames / elapsed, "ns_per_frame": elapsed / frames * 1e9}
+    return results
+
+
+class _Grill:
+    """One simulated grill: a coordinator and all its entities."""
+
+    def __init__(self, hass, modules, index: int) -> None:
+        const = modules["const"]
+        entry = SimpleNamespace(
+            entry_id=f"bench{index}",
+            data={const.CONF_DEVICE_ID: f"GRILLSBENCH{index:04d}"},
+            options={},
+        )
+        self.coordinator = modules["coordinator"].TaylorGrillCoordinator(hass, entry)
+        c, eid = self.coordinator, entry.entry_id
+        sensor = modules["sensor"]
+        binary = modules["binary_sensor"]
+        self.entities = [
+            modules["climate"].TaylorSmoker(c, eid),
+            modules["switch"].TaylorSmokerSwitch(c, eid),
+            *(sensor.TaylorSmokerSensor(c, eid, f"Probe {i}", i) for i in range(4)),
+            *(
+                sensor.TaylorProbeStatSensor(c, eid, f"Probe {i}", i, cfg)
+                for i in range(4)
+                for cfg in sensor.PROBE_STATS_CONFIG
+            ),
+            *(sensor.TaylorProbeEtaSensor(c, eid, f"Probe {i}", i) for i in (1, 2, 3)),
+            sensor.TaylorCommandLatencySensor(c, eid),
+            *(binary.TaylorBinarySensor(c, eid, cfg) for cfg in binary.SENSORS_CONFIG),
+            *(binary.TaylorStallSensor(c, eid, f"Probe {i}", i) for i in (1, 2, 3)),
+        ]
+        self.writes = 0
+        for entity in self.entities:
+            entity.async_write_ha_state = self._count_write
+
+    def _count_write(self) -> None:
+        self.writes += 1
+
+    async def async_add(self) -> None:
+        # The entities are never really added, so there is no state to restore
+        logging.getLogger("homeassistant.helpers.restore_state").setLevel(logging.ERROR)
+        for entity in self.entities:
+            await entity.async_added_to_hass()
+
+
+def _load_ha_modules() -> dict[str, Any] | None:
+    """Import the Home Assistant dependent modules, if possible."""
+    try:
+        return {
+            name: load(name)
+            for name in ("const", "coordinator", "climate", "switch", "sensor", "binary_sensor")
+        }
+    except ImportError as err:
+        print(f"skipping dispatch benchmarks: {err}", file=sys.stderr)
+        return None
+
+
+async def bench_dispatch(modules: dict[str, Any], cycles: int) -> dict[str, Any]:
+    """Measure delivering frames to all entities of 1, 10 and 100 grills."""
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(loop=loop)
+    results: dict[str, Any] = {}
+    encode_temps = protocol.encode_temps
+    status = protocol.encode_status(protocol.STATE_RUNNING)
+    target = protocol.encode_target(225)
+
+    for count in GRILL_COUNTS:
+        grills = [_Grill(hass, modules, i) for i in range(count)]
+        for grill in grills:
+            await grill.async_add()
+        # Steady cook: temps change every other cycle, status/target repeat
+        payloads = [
+            (status, encode_temps((225 + (n // 2) % 3, 150 + n // 2, None, None)), target)
+            for n in range(cycles)
+        ]
+
+        frames = 0
+        elapsed = 0.0
+        for cycle in payloads:
+            start = time.perf_counter()
+            for grill in grills:
+                for frame in cycle:
+                    grill.coordinator.async_feed(frame)
+            # Let the coalesced write pass run
+            await asyncio.sleep(0)
+            elapsed += time.perf_counter() - start
+            frames += len(cycle) * count
+
+        writes = sum(grill.writes for grill in grills)
+        for grill in grills:
+            grill.coordinator.async_stop()
+        results[f"{count}_grills"] = {
+            "entities": sum(len(grill.entities) for grill in grills),
+            "frames": frames,
+            "frames_per_s": frames / elapsed,
+            "us_per_frame": elapsed / frames * 1e6,
+            "writes_per_frame": writes / frames,
+        }
+    return results
+
+
+def _print(results: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    """Print results, with the change against a baseline run if given."""
+    for group in ("decode", "dispatch"):
+        for name, values in results.get(group, {}).items():
+            line = f"{group:9} {name:16}"
+            for key, value in values.items():
+                line += f" {key}={value:,.2f}" if isinstance(value, float) else f" {key}={value}"
+                old = (baseline or {}).get(group, {}).get(name, {}).get(key)
+                if isinstance(value, float) and old:
+                    line += f" ({(value - old) / old * 100:+.1f}%)"
+            print(line)
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100_000,
+                        help="decode iterations per packet type")
+    parser.add_argument("--cycles", type=int, default=200,
+                        help="poll cycles (3 frames each) per grill for dispatch")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="show the change against an earlier --json file")
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "decode": bench_decode(args.iterations),
+    }
+    if (modules := _load_ha_modules()) is not None:
+        results["dispatch"] = asyncio.run(bench_dispatch(modules, args.cycles))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print(f"comparing against {baseline.get('commit')} ({baseline.get('time')})")
+    _print(results, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""Fuzz the Taylor Grill frame decoder and gate on its throughput.
+
+    python tools/fuzz.py                        # check properties and throughput
+    python tools/fuzz.py --cases 200000         # a bigger corpus
+    python tools/fuzz.py --update-baseline      # store the current throughput
+
+A seeded corpus of valid, truncated, concatenated (some with a stray FA
+in between), mutated and garbage frames is run through decode_frame and
+FrameSplitter. Every case must decode without raising, give temperatures
+in range, and round-trip the frames the encoders build. Then the corpus
+is timed, and the run fails if throughput drops more than --tolerance
+below tools/fuzz_baseline.json.
+
+Throughput is stored relative to a fixed pure-Python calibration loop
+timed next to each run, so a baseline taken on one machine still means
+something on another. Expect some 10% of noise between runs; refresh the
+baseline on a quiet machine.
+Only the standard library is needed. Exits with 1 on any failure.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import platform
+import random
+import sys
+import time
+from typing import Any
+
+from _loader import load
+
+protocol = load("protocol")
+
+BASELINE = Path(__file__).resolve().parent / "fuzz_baseline.json"
+
+# A probe reading is three digits with a hundreds digit of at most 5
+MAX_PROBE = 599
+MAX_TARGET = 999
+FLAG_MASK = sum(1 << offset for offset in protocol.ERROR_FLAG_OFFSETS)
+
+KINDS = ("valid", "truncated", "concatenated", "mutated", "length", "garbage")
+
+
+def _probe(rng: random.Random) -> int | None:
+    """Return a random probe reading, sometimes unplugged."""
+    return None if rng.random() < 0.2 else rng.randint(0, MAX_PROBE)
+
+
+def _valid(rng: random.Random) -> tuple[bytes, Any]:
+    """Return an encoded frame and the value it must decode to."""
+    kind = rng.randrange(3)
+    if kind == 0:
+        state = rng.choice((protocol.STATE_STARTUP, protocol.STATE_OFF, protocol.STATE_RUNNING))
+        flags = rng.getrandbits(12) & FLAG_MASK
+        return protocol.encode_status(state, flags), ("status", state, flags)
+    if kind == 1:
+        probes = tuple(_probe(rng) for _ in protocol.PROBE_OFFSETS)
+        return protocol.encode_temps(probes), ("temps", probes)
+    target = rng.randint(1, MAX_TARGET)
+    return protocol.encode_target(target), ("target", target)
+
+
+def build_corpus(cases: int, seed: int) -> list[tuple[str, bytes, Any]]:
+    """Return (kind, payload, expected) cases.
+
+    expected is the decoded value of a valid frame, the values of every
+    frame of a concatenated payload, and None otherwise.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(cases):
+        kind = KINDS[i % len(KINDS)]
+        frame, expected = _valid(rng)
+        if kind == "valid":
+            corpus.append((kind, frame, expected))
+        elif kind == "truncated":
+            corpus.append((kind, frame[: rng.randrange(len(frame))], None))
+        elif kind == "concatenated":
+            frames = [(frame, expected)] + [_valid(rng) for _ in range(rng.randint(1, 4))]
+            payload = [data for data, _ in frames]
+            if rng.random() < 0.3:
+                # Line noise: an FA whose length byte runs past the payload
+                payload.insert(rng.randrange(len(payload)), bytes((protocol.FRAME_START, 0xFF)))
+            corpus.append((kind, b"".join(payload), [value for _, value in frames]))
+        elif kind == "mutated":
+            data = bytearray(frame)
+            for _ in range(rng.randint(1, 3)):
+                data[rng.randrange(len(data))] = rng.randrange(256)
+            corpus.append((kind, bytes(data), None))
+        elif kind == "length":
+            data = bytearray(frame)
+            data[1] = rng.randrange(256)
+            corpus.append((kind, bytes(data), None))
+        else:
+            data = bytearray(rng.randbytes(rng.randint(0, 64)))
+            if data and rng.random() < 0.5:
+                data[0] = protocol.FRAME_START
+            corpus.append((kind, bytes(data), None))
+    return corpus
+
+
+def _check_frame(frame: Any) -> str | None:
+    """Return why a decoded frame is out of range, or None."""
+    if isinstance(frame, protocol.StatusFrame):
+        if not 0 <= frame.state <= 255 or frame.flags & ~FLAG_MASK:
+            return f"status state={frame.state} flags={frame.flags:#x}"
+    elif isinstance(frame, protocol.TempsFrame):
+        if len(frame.probes) != len(protocol.PROBE_OFFSETS) or any(
+            value is not None and not 0 <= value <= MAX_PROBE for value in frame.probes
+        ):
+            return f"temps {frame.probes}"
+    elif isinstance(frame, protocol.TargetFrame):
+        if not 1 <= frame.target <= MAX_TARGET:
+            return f"target {frame.target}"
+    else:
+        return f"unexpected {type(frame).__name__}"
+    return None
+
+
+def _as_expected(frame: Any) -> Any:
+    """Return a decoded frame in the form build_corpus expects."""
+    if isinstance(frame, protocol.StatusFrame):
+        return ("status", frame.state, frame.flags)
+    if isinstance(frame, protocol.TempsFrame):
+        return ("temps", frame.probes)
+    if isinstance(frame, protocol.TargetFrame):
+        return ("target", frame.target)
+    return None
+
+
+def check(corpus: list[tuple[str, bytes, Any]], seed: int) -> list[str]:
+    """Run every case through the decoder and splitter; return the failures."""
+    rng = random.Random(seed + 1)
+    decode = protocol.decode_frame
+    failures = []
+    for kind, data, expected in corpus:
+        try:
+            frame = decode(data)
+            if frame is not None and (problem := _check_frame(frame)):
+                failures.append(f"{kind} {data.hex()}: {problem}")
+            if kind == "valid" and _as_expected(frame) != expected:
+                failures.append(f"valid {data.hex()}: decoded {_as_expected(frame)}, not {expected}")
+            if kind == "truncated" and frame is not None:
+                failures.append(f"truncated {data.hex()}: decoded {_as_expected(frame)}")
+
+            # The same bytes as a stream, cut into random chunks
+            splitter = protocol.FrameSplitter()
+            decoded = []
+            pos = 0
+            while pos < len(data):
+                step = rng.randint(1, len(data))
+                for raw in splitter.feed(data[pos : pos + step]):
+                    if raw[0] != protocol.FRAME_START or raw[1] != len(raw) or raw[-1] != protocol.FRAME_END:
+                        failures.append(f"{kind} {data.hex()}: split bad frame {bytes(raw).hex()}")
+                    frame = decode(raw)
+                    if frame is not None and (problem := _check_frame(frame)):
+                        failures.append(f"{kind} {data.hex()}: split {problem}")
+                    decoded.append(_as_expected(frame))
+                pos += step
+            if kind == "concatenated" and decoded != expected:
+                failures.append(f"concatenated {data.hex()}: split into {decoded}, not {expected}")
+        except Exception as err:  # noqa: BLE001
+            failures.append(f"{kind} {data.hex()}: {type(err).__name__}: {err}")
+    return failures
+
+
+def _timed(func) -> float:
+    """Return how long one run of func takes, in seconds."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _calibration_loop() -> None:
+    """Run a fixed byte-indexing loop, close to what the decoder does."""
+    data = bytes(range(256)) * 4
+    for _ in range(100):
+        total = 0
+        for i in range(0, len(data) - 2, 3):
+            if data[i] > 9:
+                total += data[i + 1] * 10 + data[i + 2]
+
+
+def measure(corpus: list[tuple[str, bytes, Any]], repeat: int = 7) -> dict[str, float]:
+    """Time decode_frame and FrameSplitter over the corpus."""
+    decode = protocol.decode_frame
+    payloads = [data for _, data, _ in corpus]
+
+    def run_decode() -> None:
+        for data in payloads:
+            decode(data)
+
+    stream = b"".join(payloads)
+    chunks = [stream[i : i + 64] for i in range(0, len(stream), 64)]
+
+    def run_split() -> None:
+        splitter = protocol.FrameSplitter()
+        for chunk in chunks:
+            for raw in splitter.feed(chunk):
+                decode(raw)
+
+    # Each run is scored against a calibration run timed right next to
+    # it, so a change in CPU clock between runs cancels out; the best
+    # of several pairs is kept
+    results = dict.fromkeys(
+        ("calibration_per_s", "decode_per_s", "split_bytes_per_s", "decode_score", "split_score"),
+        0.0,
+    )
+    for _ in range(repeat):
+        calibration = 1 / _timed(_calibration_loop)
+        decode_rate = len(payloads) / _timed(run_decode)
+        calibration = max(calibration, 1 / _timed(_calibration_loop))
+        split_rate = len(stream) / _timed(run_split)
+        split_calibration = max(calibration, 1 / _timed(_calibration_loop))
+        results["calibration_per_s"] = max(results["calibration_per_s"], calibration)
+        results["decode_per_s"] = max(results["decode_per_s"], decode_rate)
+        results["split_bytes_per_s"] = max(results["split_bytes_per_s"], split_rate)
+        # Machine-independent scores the gate compares
+        results["decode_score"] = max(results["decode_score"], decode_rate / calibration)
+        results["split_score"] = max(results["split_score"], split_rate / split_calibration)
+    return results
+
+
+def main() -> int:
+    """Fuzz, time and compare against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=60_000, help="corpus size")
+    parser.add_argument("--seed", type=int, default=1, help="corpus seed")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed throughput drop against the baseline (default 0.25)")
+    parser.add_argument("--baseline", default=str(BASELINE), help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store this run's throughput as the baseline")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.cases, args.seed)
+    failures = check(corpus, args.seed)
+    print(f"fuzz: {len(corpus)} cases, {len(failures)} failures")
+    for failure in failures[:20]:
+        print(f"  {failure}")
+
+    results = measure(corpus)
+    for key, value in results.items():
+        print(f"  {key}={value:,.2f}")
+
+    if args.update_baseline:
+        if failures:
+            print("not updating the baseline while cases fail")
+            return 1
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "cases": args.cases,
+                    "seed": args.seed,
+                    **{key: round(results[key], 3) for key in ("decode_score", "split_score")},
+                },
+                file,
+                indent=2,
+            )
+            file.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressed = False
+    try:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f"no baseline at {args.baseline}; run with --update-baseline")
+        baseline = {}
+    for key in ("decode_score", "split_score"):
+        if not (old := baseline.get(key)):
+            continue
+        change = (results[key] - old) / old
+        status = "ok"
+        if change < -args.tolerance:
+            status = "REGRESSION"
+            regressed = True
+        print(f"{key}: {results[key]:.3f} vs baseline {old:.3f} ({change * 100:+.1f}%) {status}")
+
+    return 1 if failures or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
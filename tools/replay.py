@@ -0,0 +1,96 @@
+"""Replay a Taylor Grill packet capture through the frame decoder.
+
+    python tools/replay.py brisket.tgcap              # as fast as possible
+    python tools/replay.py brisket.tgcap --speed 1    # original timing
+    python tools/replay.py brisket.tgcap --print      # show every frame
+
+Captures are recorded with the taylor_grill.start_capture service. The
+summary reports frames per opcode, rejected frames and decode cost.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime
+import time
+
+from _loader import load
+
+capture = load("capture")
+protocol = load("protocol")
+trace = load("trace")
+
+
+def _describe(frame) -> str:
+    """Return a one-line description of a decoded frame."""
+    if isinstance(frame, protocol.StatusFrame):
+        flags = [o for o in protocol.ERROR_FLAG_OFFSETS if frame.flag(o)]
+        return f"status state=0x{frame.state:02X} on={frame.is_on} flags={flags}"
+    if isinstance(frame, protocol.TempsFrame):
+        return "temps internal={} p1={} p2={} p3={}".format(*frame.probes)
+    return f"target {frame.target}"
+
+
+async def _replay(path: str, speed: float, show: bool, repeat: int) -> None:
+    """Replay the capture and print a summary."""
+    records = list(capture.read_capture(path))
+    splitter = protocol.FrameSplitter()
+    decode = protocol.decode_frame
+    opcodes: Counter[int] = Counter()
+    rejected = 0
+    frames = 0
+    decode_ns = 0
+
+    def handle(direction: int, data: bytes) -> None:
+        nonlocal rejected, frames, decode_ns
+        if direction != trace.DIRECTION_RX:
+            return
+        start = time.perf_counter_ns()
+        decoded = [(raw, decode(raw)) for raw in splitter.feed(data)]
+        decode_ns += time.perf_counter_ns() - start
+        for raw, frame in decoded:
+            frames += 1
+            if frame is None:
+                rejected += 1
+                opcodes[raw[3] if len(raw) > 3 else -1] += 1
+                continue
+            opcodes[frame.opcode] += 1
+            if show:
+                print(bytes(raw).hex(" "), "->", _describe(frame))
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await capture.async_replay(records, handle, speed)
+    elapsed = time.perf_counter() - started
+
+    rx = sum(1 for r in records if r[1] == trace.DIRECTION_RX)
+    if records:
+        span = records[-1][0] - records[0][0]
+        print(f"capture: {len(records)} records ({rx} received) over {span / 3600:.2f} h, "
+              f"starting {datetime.fromtimestamp(records[0][0]):%Y-%m-%d %H:%M:%S}")
+    print(f"frames: {frames} ({rejected} not decoded) in {elapsed:.3f} s")
+    print(f"dropped by the splitter: {splitter.malformed} runs, {splitter.discarded} bytes")
+    for opcode, count in sorted(opcodes.items()):
+        print(f"  opcode 0x{opcode & 0xFF:02X}: {count}")
+    if frames:
+        print(f"decode: {decode_ns / frames:.0f} ns/frame, "
+              f"{frames / (decode_ns / 1e9):,.0f} frames/s")
+
+
+def main() -> None:
+    """Parse arguments and replay."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="path to a .tgcap file")
+    parser.add_argument("--speed", type=float, default=0,
+                        help="time scale; 1 = real time, 0 = as fast as possible (default)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="replay the capture this many times")
+    parser.add_argument("--print", dest="show", action="store_true",
+                        help="print every decoded frame")
+    args = parser.parse_args()
+    asyncio.run(_replay(args.capture, args.speed, args.show, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Simulate Taylor Grill controllers on a local MQTT broker.
+
+    pip install paho-mqtt
+    python tools/simulator.py GRILLSSIM0001                  # one controller
+    python tools/simulator.py --count 200 --delay 80 --loss 0.02
+    python tools/simulator.py --count 5 --time-scale 60      # 1 h cook per minute
+
+Each simulated controller listens on ``{device_id}/app2dev`` and answers
+handshake, poll, on/off and set-target commands on ``{device_id}/dev2app``
+with 0x0B/0x0D/0x0E frames, like the ESP32 does. Pit and meat probes
+follow a simple heat-up and stall model with a random drift, and error
+flags can be injected at the offsets the binary sensors read.
+
+Add the device IDs (``--prefix`` followed by a four digit number when
+``--count`` is used) as Taylor Grill config entries to soak-test the
+integration without hardware.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import signal
+import time
+
+from _loader import load
+
+protocol = load("protocol")
+
+AMBIENT_F = 70.0
+# Pit heat-up rate limit and time constants, per second of simulated time
+PIT_MAX_RISE = 0.25
+PIT_GAIN = 0.01
+PIT_COOLING = 0.002
+MEAT_GAIN = 0.00012
+# Evaporative cooling slows meat to this fraction of its rise at 150-170F
+STALL_RANGE = (150.0, 170.0)
+STALL_FACTOR = 0.15
+STARTUP_SECONDS = 240
+# Seconds an injected error flag stays set
+ERROR_HOLD = 30
+
+
+class SimulatedController:
+    """Physics and protocol state of one controller."""
+
+    def __init__(self, device_id: str, probes: int, error_rate: float, rng: random.Random) -> None:
+        """Initialize a cold, switched-off controller."""
+        self.device_id = device_id
+        self.rng = rng
+        self.state = protocol.STATE_OFF
+        self.target = 225
+        self.pit = AMBIENT_F
+        self.meat = [AMBIENT_F if i < probes else None for i in range(3)]
+        # Bigger cuts heat slower
+        self.meat_gain = [MEAT_GAIN * rng.uniform(0.6, 1.4) for _ in range(3)]
+        self.drift = [0.0] * 4
+        self.flags = 0
+        self._flag_until: dict[int, float] = {}
+        self._started = 0.0
+        self._error_rate = error_rate
+
+    def step(self, now: float, dt: float) -> None:
+        """Advance the model by dt simulated seconds."""
+        rng = self.rng
+        if self.state == protocol.STATE_OFF:
+            self.pit += (AMBIENT_F - self.pit) * PIT_COOLING * dt
+        else:
+            if self.state == protocol.STATE_STARTUP and now - self._started > STARTUP_SECONDS:
+                self.state = protocol.STATE_RUNNING
+            rise = (self.target - self.pit) * PIT_GAIN * dt
+            self.pit += min(rise, PIT_MAX_RISE * dt) + rng.gauss(0, 0.3)
+
+        for i, meat in enumerate(self.meat):
+            if meat is None:
+                continue
+            rise = (self.pit - meat) * self.meat_gain[i] * dt
+            if STALL_RANGE[0] <= meat <= STALL_RANGE[1]:
+                rise *= STALL_FACTOR
+            self.meat[i] = meat + rise
+
+        for i in range(4):
+            self.drift[i] = max(-2.0, min(2.0, self.drift[i] + rng.gauss(0, 0.05 * dt ** 0.5)))
+
+        for offset, until in list(self._flag_until.items()):
+            if now >= until:
+                self.flags &= ~(1 << offset)
+                del self._flag_until[offset]
+        if self._error_rate and rng.random() < self._error_rate * dt:
+            offset = rng.choice(protocol.ERROR_FLAG_OFFSETS)
+            self.flags |= 1 << offset
+            self._flag_until[offset] = now + ERROR_HOLD
+
+    def status_frame(self) -> bytes:
+        """Return the current 0x0B frame."""
+        return protocol.encode_status(self.state, self.flags)
+
+    def temps_frame(self) -> bytes:
+        """Return the current 0x0E frame."""
+        readings = [self.pit, *self.meat]
+        probes = tuple(
+            None if value is None else max(0, min(599, round(value + self.drift[i])))
+            for i, value in enumerate(readings)
+        )
+        return protocol.encode_temps(probes)
+
+    def target_frame(self) -> bytes:
+        """Return the current 0x0D frame."""
+        return protocol.encode_target(self.target)
+
+    def handle(self, command: bytes, now: float) -> list[bytes]:
+        """Apply an app2dev command and return the response frames."""
+        if len(command) < protocol.MIN_FRAME_LEN or command[0] != protocol.FRAME_START:
+            return []
+        opcode = command[3]
+        if opcode == protocol.PACKET_STATUS:
+            return [self.status_frame()]
+        if opcode == protocol.PACKET_TEMPS:
+            return [self.temps_frame()]
+        if opcode == protocol.PACKET_TARGET:
+            return [self.target_frame()]
+        if opcode == protocol.OPCODE_POWER:
+            if command == protocol.CMD_ON and self.state == protocol.STATE_OFF:
+                self.state = protocol.STATE_STARTUP
+                self._started = now
+            elif command == protocol.CMD_OFF:
+                self.state = protocol.STATE_OFF
+            return [self.status_frame()]
+        if opcode == protocol.OPCODE_SET_TARGET and len(command) >= 9:
+            self.target = command[5] * 100 + command[6] * 10 + command[7]
+            return [self.target_frame()]
+        return []
+
+
+class Fleet:
+    """Run many controllers over one MQTT connection."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize the fleet from the command line arguments."""
+        self.args = args
+        rng = random.Random(args.seed)
+        if args.device_ids:
+            ids = args.device_ids
+        else:
+            ids = [f"{args.prefix}{n:04d}" for n in range(1, args.count + 1)]
+        self.controllers = {
+            device_id: SimulatedController(
+                device_id, args.probes, args.error_rate, random.Random(rng.random())
+            )
+            for device_id in ids
+        }
+        self.rng = rng
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.client = None
+        self.received = 0
+        self.sent = 0
+        self.dropped = 0
+        self._started = time.monotonic()
+
+    def now(self) -> float:
+        """Return simulated seconds since start."""
+        return (time.monotonic() - self._started) * self.args.time_scale
+
+    def connect(self) -> None:
+        """Connect to the broker and subscribe to every command topic."""
+        try:
+            import paho.mqtt.client as mqtt  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise SystemExit("the simulator needs paho-mqtt: pip install paho-mqtt") from err
+
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1, client_id=self.args.client_id)
+        else:
+            client = mqtt.Client(client_id=self.args.client_id)
+        if self.args.username:
+            client.username_pw_set(self.args.username, self.args.password)
+
+        def on_connect(client, _userdata, _flags, _rc) -> None:
+            client.subscribe("+/app2dev", qos=0)
+
+        def on_message(_client, _userdata, message) -> None:
+            self.loop.call_soon_threadsafe(self._on_command, message.topic, message.payload)
+
+        client.on_connect = on_connect
+        client.on_message = on_message
+        client.connect(self.args.host, self.args.port)
+        client.loop_start()
+        self.client = client
+
+    def _on_command(self, topic: str, payload: bytes) -> None:
+        """Answer a command after the configured delay, or drop it."""
+        device_id = topic[: -len("/app2dev")]
+        controller = self.controllers.get(device_id)
+        if controller is None:
+            return
+        self.received += 1
+        if self.rng.random() < self.args.loss:
+            self.dropped += 1
+            return
+        responses = controller.handle(payload, self.now())
+        if not responses:
+            return
+        delay = max(0.0, self.rng.gauss(self.args.delay, self.args.delay / 4) / 1000)
+        self.loop.call_later(delay, self._publish, device_id, b"".join(responses))
+
+    def _publish(self, device_id: str, payload: bytes) -> None:
+        """Send a dev2app payload."""
+        self.client.publish(f"{device_id}/dev2app", payload, qos=0)
+        self.sent += 1
+
+    async def run(self) -> None:
+        """Step the physics, push unsolicited frames and print stats."""
+        self.loop = asyncio.get_running_loop()
+        self.connect()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            self.loop.add_signal_handler(sig, stop.set)
+
+        print(f"simulating {len(self.controllers)} controllers on "
+              f"{self.args.host}:{self.args.port}, e.g. {next(iter(self.controllers))}")
+        last = self.now()
+        last_push = last
+        last_report = time.monotonic()
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), 1.0)
+            except TimeoutError:
+                pass
+            now = self.now()
+            for controller in self.controllers.values():
+                controller.step(now, now - last)
+            last = now
+
+            if self.args.push and now - last_push >= self.args.push * self.args.time_scale:
+                last_push = now
+                for device_id, controller in self.controllers.items():
+                    self._publish(device_id, controller.status_frame() + controller.temps_frame())
+
+            if time.monotonic() - last_report >= self.args.report:
+                elapsed = time.monotonic() - last_report
+                last_report = time.monotonic()
+                sample = next(iter(self.controllers.values()))
+                print(f"t={now / 60:7.1f} min  cmds/s={self.received / elapsed:7.1f}  "
+                      f"frames/s={self.sent / elapsed:7.1f}  dropped={self.dropped}  "
+                      f"[{sample.device_id}: pit={sample.pit:.0f}F "
+                      f"meat={[None if m is None else round(m) for m in sample.meat]}]")
+                self.received = self.sent = self.dropped = 0
+
+        self.client.loop_stop()
+        self.client.disconnect()
+
+
+def main() -> None:
+    """Parse arguments and run the fleet."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("device_ids", nargs="*", help="device IDs to simulate")
+    parser.add_argument("--count", type=int, default=1,
+                        help="number of controllers when no device IDs are given")
+    parser.add_argument("--prefix", default="GRILLSSIM", help="device ID prefix for --count")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=1883)
+    parser.add_argument("--username", default="Taylor")
+    parser.add_argument("--password", default="YKC6WLIFUZaBaMQU")
+    parser.add_argument("--client-id", default="taylor-grill-simulator")
+    parser.add_argument("--delay", type=float, default=50, help="mean response delay in ms")
+    parser.add_argument("--loss", type=float, default=0.0,
+                        help="probability that a command gets no response")
+    parser.add_argument("--probes", type=int, default=2, choices=range(4),
+                        help="number of meat probes plugged in")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="error flags injected per simulated second")
+    parser.add_argument("--push", type=float, default=0,
+                        help="also push status and temps unasked every N seconds")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="simulated seconds per real second")
+    parser.add_argument("--report", type=float, default=10, help="seconds between stats lines")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(Fleet(args).run())
+
+
+if __name__ == "__main__":
+    main()